@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from course_modes.models import CourseMode
+
+from .utils import clear_course_modes_cache
+
+
+@receiver(post_save, sender=CourseMode, dispatch_uid='fun.backoffice.signals.course_modes_save')
+@receiver(post_delete, sender=CourseMode, dispatch_uid='fun.backoffice.signals.course_modes_delete')
+def clear_course_modes(sender, instance, **kwargs):
+    clear_course_modes_cache(instance.course_id)
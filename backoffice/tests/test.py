@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 import mock
 
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
 from django.utils.translation import ugettext as _
@@ -32,6 +33,7 @@ from universities.tests.factories import UniversityFactory
 class BaseTestCase(ModuleStoreTestCase):
     def setUp(self):
         self.password = super(BaseTestCase, self).setUp()
+        cache.clear()
         self.course = None
         self.backoffice_group = None
 
@@ -98,6 +100,34 @@ class TestAuthentication(BaseBackoffice):
         response = self.client.get(self.list_url)
         self.assertEqual(1, len(response.context['course_infos']))
 
+    def test_search_courses(self):
+        self.fun_course.title = u"Searchable title"
+        self.fun_course.save()
+        self.login_with_backoffice_group()
+
+        response = self.client.get(self.list_url, {'search': 'searchable'})
+        self.assertEqual(1, len(response.context['course_infos']))
+        response = self.client.get(self.list_url, {'search': 'title'})
+        self.assertEqual(1, len(response.context['course_infos']))
+        response = self.client.get(self.list_url, {'search': 'unknown'})
+        self.assertEqual(0, len(response.context['course_infos']))
+
+    def test_inactive_courses_are_not_listed(self):
+        Course.objects.filter(pk=self.fun_course.pk).update(is_active=False)
+        self.login_with_backoffice_group()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(0, response.context['courses'].paginator.count)
+
+    def test_courses_missing_from_modulestore_are_listed(self):
+        FunCourseFactory.create(key=u'course-v1:org+missing+run')
+        self.login_with_backoffice_group()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(2, response.context['courses'].paginator.count)
+        self.assertEqual(2, len(response.context['course_infos']))
+        self.assertIn(u'course-v1:org+missing+run', response.content.decode('utf-8'))
+
 
 @override_settings(COURSE_SIGNALS_DISABLED=False)
 class TestGenerateCertificate(BaseBackoffice):
@@ -170,7 +200,7 @@ class TestExportCoursesList(BaseBackoffice):
         self.assertEqual(200, response.status_code)
         self.assertEqual('text/csv', response._headers['content-type'][1])
 
-        response_content = StringIO(response.content)
+        response_content = StringIO(''.join(response.streaming_content))
         data = [row for row in csv.reader(response_content)]
         self.assertEqual(2, len(data))
         course = data[1]
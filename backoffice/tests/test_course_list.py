@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import csv
+import mock
 from StringIO import StringIO
 
 from django.contrib.auth.models import User, Group
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 
 from course_modes.models import CourseMode
@@ -11,11 +13,13 @@ from student.tests.factories import CourseEnrollmentFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, CourseAboutFactory, ABOUT_ATTRIBUTES
 
+from courses import utils as courses_utils
 from fun.tests.utils import skipUnlessLms
 from student.models import UserProfile
 from universities.tests.factories import UniversityFactory
 
-from ..utils import get_course_modes
+from ..views.courses_views import get_complete_courses_info
+from ..utils import get_course_modes, get_course_mode_slugs
 from ..utils import get_enrollment_mode_count
 
 
@@ -23,6 +27,7 @@ from ..utils import get_enrollment_mode_count
 class BaseCourseList(ModuleStoreTestCase):
     def setUp(self):
         super(BaseCourseList, self).setUp(create_user=False)
+        cache.clear()
         self.user = User.objects.create(username='backoffice', is_staff=True)
         self.user.set_password('password')
         self.user.save()
@@ -59,8 +64,7 @@ class VerifiedCourseList(BaseCourseList):
 
 class TestExportCoursesList(BaseCourseList):
     def get_csv_response_rows(self, response):
-        response_content = StringIO(response.content)
-        response_content.seek(0)
+        response_content = StringIO(''.join(response.streaming_content))
         return [row for row in csv.reader(response_content)]
 
     def test_export(self):
@@ -81,6 +85,14 @@ class TestCoursesModeUtils(VerifiedCourseList):
         self.assertEqual(set(['verified', 'honor']),
                 set(course_modes[unicode(self.course1.id)]))
 
+    def test_get_course_modes_is_invalidated_on_course_mode_change(self):
+        self.assertNotIn(unicode(self.course2.id), get_course_modes())
+        self.assertEqual([], get_course_mode_slugs(self.course2.id))
+
+        CourseMode.objects.create(course_id=self.course2.id, mode_slug='honor', mode_display_name=u"honor")
+        self.assertEqual(['honor'], get_course_modes()[unicode(self.course2.id)])
+        self.assertEqual(['honor'], get_course_mode_slugs(self.course2.id))
+
     def test_get_enrollment_mode_count(self):
         mode_count = get_enrollment_mode_count(self.course2.id)
         self.assertEqual({}, mode_count)
@@ -91,3 +103,15 @@ class TestCoursesModeUtils(VerifiedCourseList):
         CourseEnrollmentFactory(course_id=self.course1.id, mode='verified')
         mode_count = get_enrollment_mode_count(self.course1.id)
         self.assertEqual({'honor': 1, 'verified': 1}, mode_count)
+
+
+class TestCompleteCoursesInfo(BaseCourseList):
+    def test_about_sections_are_fetched_in_bulk_and_cached(self):
+        with mock.patch('courses.utils.get_courses_about_sections',
+                        wraps=courses_utils.get_courses_about_sections) as mock_get_sections:
+            course_infos = list(get_complete_courses_info())
+            self.assertEqual(1, mock_get_sections.call_count)
+            self.assertEqual(ABOUT_ATTRIBUTES['effort'], course_infos[0].effort)
+
+            list(get_complete_courses_info())
+            self.assertEqual(1, mock_get_sections.call_count)
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import mock
+
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.core import mail
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from certificates.models import GeneratedCertificate
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -11,10 +15,12 @@ from student.models import UserStanding, Registration
 from student.tests.factories import UserFactory, CourseEnrollmentFactory, CourseAccessRoleFactory
 
 from course_modes.models import CourseMode
+from opaque_keys.edx.keys import CourseKey
 from courses.tests.factories import CourseFactory as FunCourseFactory, CourseUniversityRelationFactory
 from fun.tests.utils import skipUnlessLms
 from universities.tests.factories import UniversityFactory
 
+from ..utils import LIMIT_BY_PAGE
 from .test_course_list import BaseCourseList
 
 
@@ -28,18 +34,49 @@ class TestUsers(BaseCourseList):
     def test_user_list(self):
         response = self.client.get(reverse('backoffice:user-list'))
         self.assertEqual(200, response.status_code)
-        user_profiles = response.context['user_profiles'].object_list
+        user_profiles = response.context['user_profiles']
         self.assertEqual(2, len(user_profiles))
         self.assertTrue(self.user2.profile in user_profiles)
         self.assertTrue(self.user.profile in user_profiles)
 
     def test_user_list_filtering(self):
         response = self.client.get(reverse('backoffice:user-list') + '?search=user1')
-        user_profiles = response.context['user_profiles'].object_list
+        user_profiles = response.context['user_profiles']
         self.assertEqual(200, response.status_code)
         self.assertEqual(1, len(user_profiles))
         self.assertTrue(self.user2.profile in user_profiles)
 
+    def test_user_list_filtering_by_prefix(self):
+        response = self.client.get(reverse('backoffice:user-list') + '?search=ser1')
+        self.assertEqual(0, len(response.context['user_profiles']))
+
+    @mock.patch('backoffice.views.users_views.SEARCH_RESULTS_COUNT_LIMIT', 1)
+    def test_user_list_search_results_count_is_capped(self):
+        UserFactory(username='user3')
+        response = self.client.get(reverse('backoffice:user-list') + '?search=user')
+        self.assertEqual(u'1+', response.context['search_results_count'])
+
+    def test_user_list_keyset_pagination(self):
+        for index in range(LIMIT_BY_PAGE):
+            UserFactory(username='z{:03d}'.format(index))
+        response = self.client.get(reverse('backoffice:user-list'))
+        user_profiles = response.context['user_profiles']
+        self.assertEqual(LIMIT_BY_PAGE, len(user_profiles))
+        self.assertIsNotNone(response.context['next_page_query'])
+
+        response = self.client.get(reverse('backoffice:user-list') + '?' + response.context['next_page_query'])
+        user_profiles = response.context['user_profiles']
+        self.assertEqual(2, len(user_profiles))
+        self.assertEqual(['z098', 'z099'], [profile.user.username for profile in user_profiles])
+        self.assertIsNone(response.context['next_page_query'])
+
+    def test_user_list_total_count_is_cached(self):
+        response = self.client.get(reverse('backoffice:user-list'))
+        self.assertEqual(2, response.context['total_count'])
+        UserFactory()
+        response = self.client.get(reverse('backoffice:user-list'))
+        self.assertEqual(2, response.context['total_count'])
+
     def test_user_detail(self):
         CourseEnrollmentFactory(course_id=self.course1.id, user=self.user2)
         CourseAccessRoleFactory(course_id=self.course1.id, user=self.user2, role=u'test_role')
@@ -51,6 +88,36 @@ class TestUsers(BaseCourseList):
         self.assertEqual(response.context['enrollments'][0][2], False)
         self.assertEqual(set(response.context['enrollments'][0][4]), set([u'test_role']))
 
+    def test_user_detail_enrolled_in_unsynchronised_course(self):
+        CourseEnrollmentFactory(course_id=self.course1.id, user=self.user2)
+        FunCourseFactory(key=unicode(self.course2.id), is_active=False)
+        CourseEnrollmentFactory(course_id=self.course2.id, user=self.user2)
+        response = self.client.get(reverse('backoffice:user-detail', args=[self.user2.username]))
+        self.assertEqual(1, len(response.context['enrollments']))
+        self.assertEqual(unicode(self.course1.id), response.context['enrollments'][0][1])
+
+    def count_user_detail_queries(self, user):
+        url = reverse('backoffice:user-detail', args=[user.username])
+        # Warm up caches
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        return len(queries)
+
+    def test_user_detail_number_of_queries_does_not_depend_on_enrollments(self):
+        query_counts = []
+        for enrollment_count in [1, 10]:
+            user = UserFactory()
+            for index in range(enrollment_count):
+                course_key = CourseKey.from_string(u"course-v1:org+{}-{}+run".format(enrollment_count, index))
+                FunCourseFactory(key=unicode(course_key), title=u"Course {}".format(index))
+                CourseEnrollmentFactory(course_id=course_key, user=user)
+                CourseAccessRoleFactory(course_id=course_key, user=user, role=u'test_role')
+                GeneratedCertificateFactory(course_id=course_key, user=user)
+            query_counts.append(self.count_user_detail_queries(user))
+        self.assertEqual(query_counts[0], query_counts[1], query_counts)
+
     def test_change_user_detail(self):
         data = {
             'email': u"change@example.com",
@@ -5,6 +5,7 @@ from collections import defaultdict
 from django.conf import settings
 from django.contrib.auth import load_backend, BACKEND_SESSION_KEY
 from django.contrib.auth.decorators import user_passes_test
+from django.core.cache import cache
 from django.db.models import Count
 from django.http import Http404
 
@@ -69,15 +70,66 @@ def order_and_paginate_queryset(request, queryset, default_order):
     return paginator.page(page)
 
 
+def keyset_paginate_queryset(request, queryset, key):
+    """Return a page of LIMIT_BY_PAGE objects from a queryset ordered by a
+    unique key.
+
+    Contrary to order_and_paginate_queryset, pages are not fetched with an
+    OFFSET, which requires scanning all previous rows: a page starts right
+    after the key value passed in the "after" GET parameter.
+
+    Returns:
+        objects (list)
+        next_after: key value of the last object, or None if this is the
+            last page.
+    """
+    descending = 'd' in request.GET
+    after = request.GET.get('after')
+    if after:
+        queryset = queryset.filter(**{key + ('__lt' if descending else '__gt'): after})
+    queryset = queryset.order_by(('-' if descending else '') + key)
+    objects = list(queryset[:LIMIT_BY_PAGE + 1])
+    next_after = None
+    if len(objects) > LIMIT_BY_PAGE:
+        objects = objects[:LIMIT_BY_PAGE]
+        next_after = reduce(getattr, key.split('__'), objects[-1])
+    return objects, next_after
+
+
+# Course modes are cached until a course mode is saved or deleted (see
+# backoffice.signals)
+COURSE_MODES_CACHE_KEY = 'backoffice-course-modes'
+COURSE_MODES_CACHE_TIMEOUT = 60*60
+
 def get_course_modes():
     """Returns a dict of existing course modes:
         {'org/session/number': ['verified', 'honor'],}
     """
-    modes = CourseMode.objects.all()
-    course_modes = defaultdict(list)
-    for mode in modes:
-        course_modes[unicode(mode.course_id)].append(mode.mode_slug)
-    return course_modes
+    course_modes = cache.get(COURSE_MODES_CACHE_KEY)
+    if course_modes is None:
+        course_modes = {}
+        for course_id, mode_slug in CourseMode.objects.values_list('course_id', 'mode_slug'):
+            course_modes.setdefault(unicode(course_id), []).append(mode_slug)
+        cache.set(COURSE_MODES_CACHE_KEY, course_modes, COURSE_MODES_CACHE_TIMEOUT)
+    return defaultdict(list, course_modes)
+
+
+def get_course_mode_slugs(course_key):
+    """Returns the list of mode slugs of a single course, e.g: ['verified', 'honor']"""
+    cache_key = get_course_mode_slugs_cache_key(course_key)
+    mode_slugs = cache.get(cache_key)
+    if mode_slugs is None:
+        mode_slugs = list(CourseMode.objects.filter(course_id=course_key).values_list('mode_slug', flat=True))
+        cache.set(cache_key, mode_slugs, COURSE_MODES_CACHE_TIMEOUT)
+    return mode_slugs
+
+
+def get_course_mode_slugs_cache_key(course_key):
+    return u'{}-{}'.format(COURSE_MODES_CACHE_KEY, course_key)
+
+
+def clear_course_modes_cache(course_key):
+    cache.delete_many([COURSE_MODES_CACHE_KEY, get_course_mode_slugs_cache_key(course_key)])
 
 
 def get_enrollment_mode_count(course_key):
@@ -85,8 +137,8 @@ def get_enrollment_mode_count(course_key):
         {'honor': 12, 'verified: 0'}
 
     """
-    course_modes = get_course_modes()  # retrieve all course modes
-    if course_modes[unicode(course_key)]:
+    mode_slugs = get_course_mode_slugs(course_key)
+    if mode_slugs:
         # count enrollments for each course mode for given course (this will NOT find mode with 0 enrollments)
         enrollments = {enrollment['mode']: enrollment['count']
                 for enrollment in CourseEnrollment.objects.filter(course_id=course_key
@@ -94,7 +146,7 @@ def get_enrollment_mode_count(course_key):
 
     # build convenient dict like {'honor': 12, 'verified': 0}
     mode_count = {}
-    for mode in course_modes[unicode(course_key)]:
+    for mode in mode_slugs:
         mode_count[mode] = enrollments[mode] if mode in enrollments else 0
 
     return mode_count
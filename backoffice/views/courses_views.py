@@ -15,7 +15,7 @@ from django.views.decorators.http import require_POST
 from pure_pagination import Paginator, EmptyPage, PageNotAnInteger
 
 from courses.models import Course, CourseUniversityRelation
-from courses.utils import get_about_section
+from courses.utils import get_cached_courses_about_sections
 from courseware.courses import get_cms_course_link
 
 from opaque_keys.edx.keys import CourseKey
@@ -25,10 +25,11 @@ from universities.models import University
 from xmodule.modulestore.django import modulestore
 
 from fun.utils import funwiki as wiki_utils
-from fun.utils.export_data import csv_response
+from fun.utils.export_data import csv_response, csv_streaming_response
 
 from ..certificate_manager.verified import get_verified_student_grades, get_enrolled_verified_students
-from ..utils import get_course, group_required, get_course_modes, get_enrollment_mode_count
+from ..utils import (get_course, group_required, get_course_modes, get_enrollment_mode_count,
+        order_and_paginate_queryset)
 from ..utils_proctorU_api import get_mongo_reports, students_registered_in_pu, users_with_cancelled_reservations
 
 logger = logging.getLogger(__name__)
@@ -56,6 +57,8 @@ COURSE_FIELDS = [
 ABOUT_SECTION_FIELDS = ['effort', 'video']
 FunCourse = namedtuple('FunCourse', COURSE_FIELDS)
 CompleteFunCourse = namedtuple('CompleteFunCourse', COURSE_FIELDS + ABOUT_SECTION_FIELDS)
+# Number of courses for which complete information is fetched at once
+COMPLETE_COURSES_INFO_BATCH_SIZE = 100
 
 @group_required('fun_backoffice')
 def courses_list(request):
@@ -68,23 +71,26 @@ def courses_list(request):
         filename = 'export-cours-%s.csv' % datetime.datetime.now().strftime('%Y-%m-%d')
         course_infos = get_complete_courses_info()
 
-        rows = [
+        rows = (
             (ci.title, ci.university, ci.course.id.org, ci.course.id.course, ci.course.id.run,
              format_datetime(ci.course.start), format_datetime(ci.course.end),
              format_datetime(ci.course.enrollment_start), format_datetime(ci.course.enrollment_end),
              ci.students_count, ci.effort,' https://%s%s' % (settings.LMS_BASE, ci.course_image_url), ci.video, ci.url
              )
             for ci in course_infos
-        ]
+        )
 
-        response = csv_response(csv_header, rows, filename)
+        response = csv_streaming_response(csv_header, rows, filename)
 
         return response
     else:
         search_pattern = request.GET.get('search')
-        course_infos = get_filtered_course_infos(search_pattern=search_pattern)
+        courses = get_filtered_courses(search_pattern=search_pattern)
+        courses = order_and_paginate_queryset(request, courses, 'key')
+        course_infos = get_course_infos_for_page(courses.object_list)
 
     return render(request, 'backoffice/courses/list.html', {
+        'courses': courses,
         'course_infos': course_infos,
         'pattern': search_pattern,
         'tab': 'courses',
@@ -286,33 +292,60 @@ def wiki(request, course_key_string, action=None):
 
         return redirect(reverse('backoffice:course-wiki', args=[course_key_string]))
 
-    pages = wiki_utils.get_page_tree([base_page])
     html = _(u"This course has no wiki")
-    if any(pages):
-        pages, html = wiki_utils.render_html_tree(pages, '')
+    if base_page:
+        html = wiki_utils.get_html_tree(base_page)
 
     return render(request, 'backoffice/courses/wiki.html', {
             'course_key_string': course_key_string,
             'course_info': course_info,
-            'pages': pages,
             'html': html,
             'tab': 'courses',
             'subtab': 'wiki',
         })
 
-def get_filtered_course_infos(search_pattern=None):
-    courses = get_sorted_courses()
-    course_infos = get_course_infos_or_404(courses)
-
+def get_filtered_courses(search_pattern=None):
+    """Active courses, as synchronised from the modulestore by the
+    update_courses command."""
+    courses = Course.objects.filter(is_active=True)
     if search_pattern:
-        course_infos = [course for course in course_infos
-                        if search_pattern in course['title']
-                        or search_pattern in course['course'].id.to_deprecated_string()]
+        courses = courses.filter(Q(key__icontains=search_pattern) | Q(title__icontains=search_pattern))
+    return courses
+
+def get_course_infos_for_page(courses):
+    """Fetch the modulestore data of a single page of courses.
 
-    return course_infos
+    Courses that were removed from the modulestore since the last run of
+    update_courses are kept on the page, with an empty course descriptor, so
+    that the page matches the pagination.
+    """
+    store = modulestore()
+    course_descriptors = [
+        store.get_course(CourseKey.from_string(course.key), depth=0) for course in courses
+    ]
+    course_infos = iter(get_course_infos_or_404(
+        [course_descriptor for course_descriptor in course_descriptors if course_descriptor is not None]
+    ))
+    return [
+        next(course_infos) if course_descriptor is not None else {'course': None, 'fun': course}
+        for course, course_descriptor in zip(courses, course_descriptors)
+    ]
 
 def get_complete_courses_info():
-    return [get_complete_course_info(course) for course in get_sorted_courses()]
+    """Iterate on the complete info of all courses.
+
+    Course info and about sections are fetched in bulk, by batches of
+    COMPLETE_COURSES_INFO_BATCH_SIZE courses.
+
+    Yields:
+        CompleteFunCourse
+    """
+    courses = get_sorted_courses()
+    for start in range(0, len(courses), COMPLETE_COURSES_INFO_BATCH_SIZE):
+        for course_info in get_complete_courses_info_batch(
+                courses[start:start + COMPLETE_COURSES_INFO_BATCH_SIZE]
+        ):
+            yield course_info
 
 def get_sorted_courses():
     courses = modulestore().get_courses()
@@ -325,9 +358,16 @@ def get_complete_course_info(course):
     Returns:
         CompleteFunCourse
     """
-    course_infos = get_course_infos_or_404([course])[0]
-    course_infos.update(get_about_sections(course))
-    return CompleteFunCourse(**course_infos)
+    return get_complete_courses_info_batch([course])[0]
+
+def get_complete_courses_info_batch(courses):
+    course_infos = get_course_infos_or_404(courses)
+    about_sections = get_cached_courses_about_sections(
+        [course_info['course'] for course_info in course_infos], ABOUT_SECTION_FIELDS
+    )
+    for course_info in course_infos:
+        course_info.update(clean_about_sections(about_sections[course_info['course'].id]))
+    return [CompleteFunCourse(**course_info) for course_info in course_infos]
 
 
 def get_course_infos_or_404(course_descriptors):
@@ -351,9 +391,9 @@ def get_course_infos_or_404(course_descriptors):
         for course_descriptor in course_descriptors
     ]
 
-def get_about_sections(course_descriptor):
+def clean_about_sections(sections):
     about_sections = {
-        field: get_about_section(course_descriptor, field) or ''
+        field: sections.get(field) or ''
         for field in ABOUT_SECTION_FIELDS
     }
     about_sections['effort'] = about_sections['effort'].replace('\n', '')  # clean the many CRs
@@ -7,6 +7,7 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import render, redirect, get_object_or_404
@@ -35,40 +36,82 @@ from ..certificate_manager.utils import (
     set_certificate_filename,
 )
 from ..forms import SearchUserForm, UserForm, UserProfileForm
-from ..utils import (get_course, group_required, get_course_key,
-        order_and_paginate_queryset, get_used_backend)
+from ..utils import (get_course, group_required, get_course_key, get_course_modes,
+        keyset_paginate_queryset, order_and_paginate_queryset, get_used_backend)
 
 
 logger = logging.getLogger(__name__)
 
 
+# Counting all users is slow: the total number of users is cached
+USER_COUNT_CACHE_TIMEOUT = 10*60
+# Search results are counted up to this limit only
+SEARCH_RESULTS_COUNT_LIMIT = 1000
+
+
 @group_required('fun_backoffice')
 def user_list(request):
+    """List users, by pages of LIMIT_BY_PAGE.
+
+    Users are searched by prefix of their username, email or name, such that
+    database indexes can be used. Pages sorted by username, which is the
+    default, are fetched with keyset pagination.
+    """
     form = SearchUserForm(data=request.GET)
     user_profiles = UserProfile.objects
+    site = None
     if settings.FEATURES['USE_MICROSITES']:
-        user_profiles = user_profiles.filter(user__usersignupsource__site=microsite.get_value('SITE_NAME'))
-    total_count = user_profiles.count()
+        site = microsite.get_value('SITE_NAME')
+        user_profiles = user_profiles.filter(user__usersignupsource__site=site)
+    total_count = get_user_count(user_profiles, site)
 
     user_profiles = user_profiles.select_related('user')
-    if form.data and form.is_valid():
+    search_results_count = total_count
+    if form.data and form.is_valid() and form.cleaned_data['search']:
         pattern = form.cleaned_data['search']
         user_profiles = user_profiles.filter(
-            Q(user__username__icontains=pattern)
-            | Q(user__email__icontains=pattern)
-            | Q(name__icontains=pattern)
+            Q(user__username__istartswith=pattern)
+            | Q(user__email__istartswith=pattern)
+            | Q(name__istartswith=pattern)
         )
-    user_profiles = order_and_paginate_queryset(request, user_profiles, 'user__username')
+        search_results_count = user_profiles[:SEARCH_RESULTS_COUNT_LIMIT + 1].count()
+        if search_results_count > SEARCH_RESULTS_COUNT_LIMIT:
+            search_results_count = u'{}+'.format(SEARCH_RESULTS_COUNT_LIMIT)
+
+    page = None
+    next_after = None
+    if request.GET.get('order', 'user__username') == 'user__username':
+        user_profiles, next_after = keyset_paginate_queryset(request, user_profiles, 'user__username')
+    else:
+        page = order_and_paginate_queryset(request, user_profiles, 'user__username')
+        user_profiles = page.object_list
+
+    next_page_query = None
+    if next_after is not None:
+        next_page_query = request.GET.copy()
+        next_page_query['after'] = next_after
+        next_page_query = next_page_query.urlencode()
 
     return render(request, 'backoffice/users.html', {
         'user_profiles': user_profiles,
-        'search_results_count': user_profiles.paginator.count,
+        'page': page,
+        'next_page_query': next_page_query,
+        'search_results_count': search_results_count,
         'total_count': total_count,
         'form': form,
         'tab': 'users',
     })
 
 
+def get_user_count(user_profiles, site=None):
+    cache_key = u'backoffice-user-count-{}'.format(site or '')
+    count = cache.get(cache_key)
+    if count is None:
+        count = user_profiles.count()
+        cache.set(cache_key, count, USER_COUNT_CACHE_TIMEOUT)
+    return count
+
+
 def ban_user(request, user):
     user_account, _created = UserStanding.objects.get_or_create(
         user=user, defaults={'changed_by': request.user})
@@ -212,6 +255,32 @@ def get_accepted_payment_terms(user):
     return payment_terms
 
 
+def get_course_titles(course_key_strings):
+    """Fetch the titles of many courses at once.
+
+    Titles are read from the courses.Course table in a single query. Only
+    the courses that were not yet synchronised to this table are looked up in
+    the modulestore.
+
+    Returns:
+        dict: {course key string: title}. Courses that no longer exist are not
+        included.
+    """
+    titles = {}
+    synchronised_keys = set()
+    for key, title, is_active in Course.objects.filter(
+            key__in=course_key_strings
+    ).values_list('key', 'title', 'is_active'):
+        synchronised_keys.add(key)
+        if is_active:
+            titles[key] = title
+    for key in set(course_key_strings) - synchronised_keys:
+        course = get_course(key)
+        if course:
+            titles[key] = course.display_name
+    return titles
+
+
 def hashid_for_verified(cert):
     if cert.mode == GeneratedCertificate.MODES.verified:
         return cert_id_encode(settings.SECRET_KEY, cert.id)
@@ -243,26 +312,26 @@ def user_detail(request, username):
             data=request.POST or None)
 
     disabled = UserStanding.objects.filter(user=user,
-                                           account_status=UserStanding.ACCOUNT_DISABLED)
+                                           account_status=UserStanding.ACCOUNT_DISABLED
+                                           ).select_related('changed_by')
 
     enrollments = []
-    optouts = Optout.objects.filter(user=user).values_list('course_id', flat=True)
+    optouts = set(unicode(course_id) for course_id in
+                  Optout.objects.filter(user=user).values_list('course_id', flat=True))
     user_roles = defaultdict(list)
     for car in CourseAccessRole.objects.filter(user=user).exclude(course_id=CourseKeyField.Empty):
         user_roles[unicode(car.course_id)].append(car.role)
 
-    course_modes = defaultdict(list)
-    modes = CourseMode.objects.all()
-    for course in modes:
-        course_modes[unicode(course.course_id)].append([course.mode_slug, course.min_price])
+    course_modes = get_course_modes()
 
-    for enrollment in CourseEnrollment.objects.filter(user=user):
+    user_enrollments = list(CourseEnrollment.objects.filter(user=user))
+    course_titles = get_course_titles([unicode(enrollment.course_id) for enrollment in user_enrollments])
+    for enrollment in user_enrollments:
         key = unicode(enrollment.course_id)
         optout = key in optouts
-        course = get_course(key)
-        if not course:
+        if key not in course_titles:
             continue  # enrollment can exists for course that does not exist anymore in mongo
-        title = course.display_name
+        title = course_titles[key]
         course_roles = user_roles.get(key, [])
         enrollments.append((title, unicode(enrollment.course_id), optout, enrollment.mode,
                 course_roles, enrollment.is_active))
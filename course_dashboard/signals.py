@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from certificates.models import GeneratedCertificate
+
+from .stats import clear_certificate_stats_cache
+
+
+@receiver(post_save, sender=GeneratedCertificate, dispatch_uid='fun.course_dashboard.signals.certificate_save')
+@receiver(post_delete, sender=GeneratedCertificate, dispatch_uid='fun.course_dashboard.signals.certificate_delete')
+def clear_certificate_stats(sender, instance, **kwargs):
+    clear_certificate_stats_cache(instance.course_id)
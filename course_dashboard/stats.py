@@ -3,6 +3,7 @@ from datetime import datetime
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
 from django.db.models import Count
 
@@ -14,6 +15,7 @@ from opaque_keys import InvalidKeyError
 import lms.lib.comment_client as comment_client
 from student.models import CourseEnrollment
 from student.models import User
+from wiki.models import ArticleRevision, URLPath
 
 import fun.utils.countries
 
@@ -40,14 +42,16 @@ def enrollments_per_day(course_key_string=None, since=None):
         .order_by(period_name)
     )
 
-    def dateify(date):
-        if isinstance(date, datetime):
-            return date
-        return datetime.strptime(date, "%Y-%m-%d")
-
     results = [(dateify(result[period_name]), result['enrollment_count']) for result in query]
     return add_days_with_no_enrollments(results)
 
+def dateify(day):
+    """Convert the result of a date_trunc_sql query to a datetime. Depending on
+    the database, results are either datetime objects or strings."""
+    if isinstance(day, datetime):
+        return day
+    return datetime.strptime(day[:10], "%Y-%m-%d")
+
 def add_days_with_no_enrollments(enrollments):
     """Fill holes in the enrollments/day stats.
 
@@ -175,6 +179,62 @@ def most_active_username(threads):
     # user_activity is of the form {"username": count, ...}
     return max(user_activity.items(), key=lambda i: i[1])[0]
 
+def wiki_activity(root_urlpath):
+    """Aggregate the activity of the wiki pages below a root page.
+
+    Revisions are counted by a single query, grouped by article, user and day,
+    over the MPTT subtree of the root page.
+
+    Returns:
+        urlpaths (list): wiki pages below the root page
+        article_creation ({date: count} dict): page creations per day
+        article_revision ({date: count} dict): page revisions per day
+        revision_counts ({urlpath: count} dict): revisions per page
+        user_activity ({user: count} dict): revisions per user. Anonymous
+            revisions are attributed to the article owner.
+    """
+    urlpaths = list(
+        URLPath.objects.filter(
+            tree_id=root_urlpath.tree_id,
+            lft__gt=root_urlpath.lft,
+            rght__lt=root_urlpath.rght,
+        ).select_related('article', 'article__current_revision')
+    )
+    urlpaths_by_article_id = {urlpath.article_id: urlpath for urlpath in urlpaths}
+
+    article_creation = defaultdict(int)
+    for urlpath in urlpaths:
+        article_creation[urlpath.article.created.date()] += 1
+
+    period_name = 'day'
+    truncate_date = connection.ops.date_trunc_sql(
+        period_name, '{}.created'.format(ArticleRevision._meta.db_table)
+    )
+    revisions = (ArticleRevision.objects
+        .filter(article_id__in=urlpaths_by_article_id.keys())
+        .extra({period_name: truncate_date})
+        .values('article_id', 'user_id', period_name)
+        .annotate(revision_count=Count('pk'))
+        .order_by()
+    )
+
+    article_revision = defaultdict(int)
+    revision_counts = defaultdict(int)
+    user_id_activity = defaultdict(int)
+    for result in revisions:
+        urlpath = urlpaths_by_article_id[result['article_id']]
+        count = result['revision_count']
+        article_revision[dateify(result[period_name]).date()] += count
+        revision_counts[urlpath] += count
+        user_id_activity[result['user_id'] or urlpath.article.owner_id] += count
+
+    users = User.objects.in_bulk([user_id for user_id in user_id_activity if user_id is not None])
+    user_activity = {
+        users[user_id]: count for user_id, count in user_id_activity.items() if user_id in users
+    }
+
+    return urlpaths, article_creation, article_revision, revision_counts, user_activity
+
 class EnrollmentStats(object):
     """Provide enrollments stats for a given course."""
 
@@ -199,32 +259,77 @@ class EnrollmentStats(object):
         return self.total() * 1. / self.day_span()
 
 
+# Certificate stats are cached until a certificate is saved or deleted (see
+# course_dashboard.signals)
+CERTIFICATE_STATS_CACHE_TIMEOUT = 60*60
+
+
 class CertificateStats(object):
-    """Provide certificate stats for a given course."""
+    """Provide certificate stats for a given course, or for all courses if
+    course_key_string is None.
+
+    All counters are computed from a single query grouped by (mode, status).
+    """
+
+    def __init__(self, course_key_string=None):
+        self.counts = certificate_counts(course_key_string)
 
-    def __init__(self, course_key_string):
-        self.certificates = GeneratedCertificate.objects.filter(course_id=CourseKey.from_string(course_key_string))
+    def count(self, mode=None, status=None):
+        return sum(
+            count for (cert_mode, cert_status), count in self.counts.iteritems()
+            if (mode is None or cert_mode == mode) and (status is None or cert_status == status)
+        )
 
     def not_passing(self):
         """Return the number of failed certificates"""
-        return self.certificates.filter(status=CertificateStatuses.notpassing).count()
+        return self.count(status=CertificateStatuses.notpassing)
 
     def passing(self):
         """Return the number of available certificates"""
-        return self.certificates.filter(status=CertificateStatuses.downloadable).count()
+        return self.count(status=CertificateStatuses.downloadable)
 
     def honor(self):
-        honor_certs = self.certificates.filter(mode=GeneratedCertificate.MODES.honor)
-        return {
-            "passing": honor_certs.filter(status=CertificateStatuses.downloadable).count(),
-            "not_passing": honor_certs.filter(status=CertificateStatuses.notpassing).count(),
-        }
+        return self.mode_stats(GeneratedCertificate.MODES.honor)
 
     def verified(self):
-        verified_certs = self.certificates.filter(mode=GeneratedCertificate.MODES.verified)
+        return self.mode_stats(GeneratedCertificate.MODES.verified)
+
+    def mode_stats(self, mode):
         return {
-            "passing": verified_certs.filter(status=CertificateStatuses.downloadable).count(),
-            "not_passing": verified_certs.filter(status=CertificateStatuses.notpassing).count(),
+            "passing": self.count(mode=mode, status=CertificateStatuses.downloadable),
+            "not_passing": self.count(mode=mode, status=CertificateStatuses.notpassing),
         }
+
     def total(self):
-        return self.certificates.count()
+        return self.count()
+
+
+def certificate_counts(course_key_string=None):
+    """
+    Returns:
+        {(mode, status): count} dict for the given course, or for all courses
+        if course_key_string is None.
+    """
+    cache_key = certificate_stats_cache_key(course_key_string)
+    counts = cache.get(cache_key)
+    if counts is None:
+        certificates = GeneratedCertificate.objects.all()
+        if course_key_string is not None:
+            certificates = certificates.filter(course_id=CourseKey.from_string(course_key_string))
+        rows = certificates.values('mode', 'status').annotate(count=Count('pk')).order_by()
+        counts = {(row['mode'], row['status']): row['count'] for row in rows}
+        cache.set(cache_key, counts, CERTIFICATE_STATS_CACHE_TIMEOUT)
+    return counts
+
+
+def certificate_stats_cache_key(course_key_string=None):
+    if course_key_string is None:
+        return 'course-dashboard-certificate-stats'
+    return u'course-dashboard-certificate-stats-{}'.format(CourseKey.from_string(course_key_string))
+
+
+def clear_certificate_stats_cache(course_key):
+    cache.delete_many([
+        certificate_stats_cache_key(),
+        certificate_stats_cache_key(unicode(course_key)),
+    ])
@@ -36,3 +36,8 @@ class GlobalViewsTestCase(ModuleStoreTestCase):
         url = reverse('course-dashboard-global:student-map')
         response = self.client.get(url)
         self.assertEqual(200, response.status_code)
+
+    def test_certificate_stats(self):
+        url = reverse('course-dashboard-global:certificate-stats')
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
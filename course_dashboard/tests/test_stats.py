@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from django.core.cache import cache
 from django.utils import timezone
 
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -18,6 +19,7 @@ from .base import BaseCourseDashboardTestCase
 class StatsTestCase(BaseCourseDashboardTestCase):
     def setUp(self):
         super(StatsTestCase, self).setUp()
+        cache.clear()
         self.user = UserFactory()
 
     def test_average_enrollments(self):
@@ -165,6 +167,42 @@ class StatsTestCase(BaseCourseDashboardTestCase):
         self.assertEqual(certificate_stats.total(), 4)
 
 
+    def test_certificate_stats_are_computed_in_a_single_query(self):
+        GeneratedCertificateFactory(course_id=self.course.id, user=self.user,
+                                    status=CertificateStatuses.notpassing)
+        GeneratedCertificateFactory(course_id=self.course.id, user=UserFactory(),
+                                    status=CertificateStatuses.downloadable, mode="verified")
+        with self.assertNumQueries(1):
+            certificate_stats = stats.CertificateStats(unicode(self.course.id))
+            self.assertEqual(certificate_stats.passing(), 1)
+            self.assertEqual(certificate_stats.honor()["not_passing"], 1)
+            self.assertEqual(certificate_stats.verified()["passing"], 1)
+            self.assertEqual(certificate_stats.total(), 2)
+        with self.assertNumQueries(0):
+            stats.CertificateStats(unicode(self.course.id))
+
+    def test_certificate_stats_cache_is_cleared_on_certificate_save(self):
+        certificate = GeneratedCertificateFactory(course_id=self.course.id, user=self.user,
+                                                  status=CertificateStatuses.notpassing)
+        self.assertEqual(stats.CertificateStats(unicode(self.course.id)).passing(), 0)
+        self.assertEqual(stats.CertificateStats(None).passing(), 0)
+
+        certificate.status = CertificateStatuses.downloadable
+        certificate.save()
+        self.assertEqual(stats.CertificateStats(unicode(self.course.id)).passing(), 1)
+        self.assertEqual(stats.CertificateStats(None).passing(), 1)
+
+    def test_global_certificate_stats(self):
+        other_course = CourseFactory.create()
+        GeneratedCertificateFactory(course_id=self.course.id, user=self.user,
+                                    status=CertificateStatuses.downloadable)
+        GeneratedCertificateFactory(course_id=other_course.id, user=UserFactory(),
+                                    status=CertificateStatuses.downloadable, mode="verified")
+        certificate_stats = stats.CertificateStats(None)
+        self.assertEqual(certificate_stats.passing(), 2)
+        self.assertEqual(certificate_stats.honor()["passing"], 1)
+        self.assertEqual(certificate_stats.verified()["passing"], 1)
+
     def test_certificate_stats_with_no_generated_certificates(self):
         certificate_stats = stats.CertificateStats(unicode(self.course.id))
         self.assertEqual(certificate_stats.not_passing(), 0)
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from courseware.tests.factories import InstructorFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from course_dashboard import stats
 from fun.tests.utils import skipUnlessLms
 
 
@@ -37,3 +40,26 @@ class WikiTestCase(ModuleStoreTestCase):
         response = self.client.get(reverse('course-dashboard:wiki-activity',
                 kwargs={'course_id': course.id.to_deprecated_string()}))
         self.assertEqual(200, response.status_code)
+
+    def test_wiki_activity_stats(self):
+        from course_wiki.views import get_or_create_root
+        from wiki.models import ArticleRevision
+
+        wiki = get_or_create_root()
+        root = self.create_urlpath(wiki, 'root')
+        child = self.create_urlpath(root, 'Child')
+        grandchild = self.create_urlpath(child, 'Grandchild')
+        child.article.add_revision(ArticleRevision(title='Child', content='New content', user=self.user))
+
+        with CaptureQueriesContext(connection) as queries:
+            urlpaths, article_creation, article_revision, revision_counts, user_activity = (
+                stats.wiki_activity(root)
+            )
+
+        self.assertLessEqual(len(queries), 3)
+        self.assertEqual(set([child.id, grandchild.id]), set([urlpath.id for urlpath in urlpaths]))
+        self.assertEqual(2, sum(article_creation.values()))
+        self.assertEqual(3, sum(article_revision.values()))
+        self.assertEqual({child.id: 2, grandchild.id: 1},
+                         {urlpath.id: count for urlpath, count in revision_counts.items()})
+        self.assertEqual({self.user: 3}, user_activity)
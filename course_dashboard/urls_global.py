@@ -3,5 +3,6 @@ from django.conf.urls import url, patterns
 urlpatterns = patterns('course_dashboard.views',
     url(r'^enrollments/$', 'global_enrollment_stats', name='enrollment-stats'),
     url(r'^map/$', 'global_student_map', name='student-map'),
+    url(r'^certificate_stats/$', 'global_certificate_stats', name='certificate-stats'),
     url(r'^$', 'global_enrollment_stats', name='home'),
 )
@@ -1,13 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from collections import defaultdict
 from datetime import datetime
 import time
 
 from django.shortcuts import render
 from django.utils.formats import date_format
 
-from wiki.models import URLPath, Article
+from wiki.models import URLPath
 
 from course_wiki.utils import course_wiki_slug
 from courseware.courses import get_course_by_id
@@ -134,24 +133,15 @@ def wiki_activity(request, course_id):
 
     urlpath = get_urlpath(course_id)
     data = {}
-    data['article_creation'] = defaultdict(int)
-    data['revision_counts'] = defaultdict(int)
-    data['article_revision'] = defaultdict(int)
-    data['user_activity'] = defaultdict(int)
+    data['article_creation'] = {}
+    data['revision_counts'] = {}
+    data['article_revision'] = {}
+    data['user_activity'] = {}
     data['urlpaths'] = []
-    data['page_count'] = 0
 
     if urlpath:
-        root = Article.objects.get(id=urlpath.id)  # get the root article of the course
-        urlpaths = root.descendant_objects()
-        for urlpath in urlpaths:
-            data['urlpaths'].append(urlpath)
-            data['article_creation'][urlpath.article.created.date()] += 1
-            for revision in urlpath.article.articlerevision_set.all():
-                data['revision_counts'][urlpath] += 1
-                data['article_revision'][revision.created.date()] += 1
-                # use Article owner if revision is anonymous (tests)
-                data['user_activity'][revision.user or urlpath.article.owner] += 1
+        (data['urlpaths'], data['article_creation'], data['article_revision'],
+         data['revision_counts'], data['user_activity']) = stats.wiki_activity(urlpath)
 
     series = []
     series.append(sorted(formatted_dates(data['article_creation'].items())[1], key=lambda item: item[0]))
@@ -210,7 +200,15 @@ def date_to_js_timestamp(date):
 def certificate_stats(request, course_id):
     """Return basic certificate stats (success, failure), split by enrollment mode."""
     certif_stats = stats.CertificateStats(course_id)
-    return render(request, 'course_dashboard/certificate-stats.html',
+    return certificate_stats_response(request, certif_stats, 'course_dashboard/certificate-stats.html', course_id)
+
+@staff_required
+def global_certificate_stats(request):
+    certif_stats = stats.CertificateStats(None)
+    return certificate_stats_response(request, certif_stats, 'course_dashboard/certificate-stats-global.html', None)
+
+def certificate_stats_response(request, certif_stats, template, course_id):
+    return render(request, template,
                   {'course_id': course_id,
                    'passing': certif_stats.passing(),
                    'verified': certif_stats.verified(),
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import mock
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
 from django.utils.translation import ugettext_lazy as _
@@ -19,6 +21,7 @@ from universities.tests.factories import UniversityFactory
 class FeedTest(ModuleStoreTestCase, RSSDeclarationMixin):
     def setUp(self):
         super(FeedTest, self).setUp()
+        cache.clear()
         date = datetime.datetime(2015, 1, 1, 0, 0, 0)
 
         self.url = reverse('fun-courses:feed')
@@ -53,3 +56,27 @@ class FeedTest(ModuleStoreTestCase, RSSDeclarationMixin):
         #self.assertEqual(u'2015-01-31T00:00:00+00:00', course3['start_date'])
         self.assertEqual(u"Université Paris Descartes", course2['university'])
         self.assertEqual(u"FÛN", course3['university'])
+
+    def test_feed_is_refreshed_when_a_course_changes(self):
+        self.assertEqual('item2', dict(self.get_parsed_feed()['channel']['item'][0])['title'])
+        self.item2.title = 'new title'
+        self.item2.save()
+        self.assertEqual('new title', dict(self.get_parsed_feed()['channel']['item'][0])['title'])
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(200, response.status_code)
+        last_modified = response['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(304, response.status_code)
+
+    def test_feed_is_modified_when_a_course_is_hidden(self):
+        with mock.patch('courses.models.time', return_value=1000):
+            self.item1.save()
+            last_modified = self.client.get(self.url)['Last-Modified']
+        with mock.patch('courses.models.time', return_value=2000):
+            self.item3.show_in_catalog = False
+            self.item3.save()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(200, response.status_code)
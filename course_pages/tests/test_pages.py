@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 
@@ -8,6 +9,7 @@ from courses.choices import COURSE_LANGUAGES
 from courses.utils import get_courses_per_language
 
 from fun.tests.utils import skipUnlessLms
+from course_pages.views import get_catalog_summary
 
 
 @skipUnlessLms
@@ -18,6 +20,16 @@ class CourseListTest(TestCase):
         response = self.client.get(url)
         self.assertContains(response, 'courses')
 
+    def test_catalog_summary_is_cached_until_a_course_changes(self):
+        cache.clear()
+        Course.objects.create(key='1', language='fr', is_active=True, show_in_catalog=True)
+        self.assertEqual(1, get_catalog_summary()['courses_count_current'])
+        with self.assertNumQueries(0):
+            get_catalog_summary()
+
+        Course.objects.create(key='2', language='fr', is_active=True, show_in_catalog=True)
+        self.assertEqual(2, get_catalog_summary()['courses_count_current'])
+
     def test_filter_url(self):
         url = reverse('fun-courses:filter', kwargs={'subject': 'physics'})
         self.assertEqual("/cours/#filter/subject/physics", url)
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import datetime
+
 from django.conf import settings
 from django.contrib.syndication.views import Feed
+from django.core.cache import cache
 from django.template.loader import render_to_string
 from django.utils.feedgenerator import Rss201rev2Feed
-from django.utils.translation import ugettext_lazy as _
+from django.utils.timezone import now, utc
+from django.utils.translation import get_language, ugettext_lazy as _
+from django.views.decorators.http import last_modified
 
 from edxmako.shortcuts import render_to_response
 
@@ -15,21 +20,44 @@ from courses.managers import annotate_with_public_courses
 from courses.utils import get_courses_per_language
 
 
+# The feed and the catalog summary are also refreshed when a course changes,
+# since their cache keys contain the catalog version
+COURSES_FEED_CACHE_TIMEOUT = 24*60*60
+CATALOG_SUMMARY_CACHE_TIMEOUT = 24*60*60
+
 def courses_index(request, subject=None):
     """
     Args:
         subject (str): subject slug that allows to reverse course filtering urls.
     """
-    languages = get_courses_per_language()
-    return render_to_response('course_pages/index.html', {
-        "course_subjects": annotate_with_public_courses(CourseSubject.objects.by_score()),
-        "universities": annotate_with_public_courses(University.objects.not_obsolete().by_score()),
-        "languages": languages,
-        "courses_count_start_soon": Course.objects.start_soon().count(),
-        "courses_count_enrollment_ends_soon": Course.objects.enrollment_ends_soon().count(),
-        "courses_count_new": Course.objects.new().count(),
-        "courses_count_current": Course.objects.current().count(),
-    })
+    return render_to_response('course_pages/index.html', get_catalog_summary())
+
+
+def get_catalog_summary():
+    """
+    Return the catalog filters and their course counts.
+
+    The summary is cached per language until a course changes. The day is
+    also part of the cache key since "soon" counters depend on the current
+    date.
+    """
+    cache_key = u"course-pages-catalog-summary-{}-{}-{}".format(
+        get_language(), Course.get_catalog_version(), now().date().isoformat()
+    )
+    summary = cache.get(cache_key)
+    if summary is None:
+        counts = Course.objects.public_counts()
+        summary = {
+            "course_subjects": list(annotate_with_public_courses(CourseSubject.objects.by_score())),
+            "universities": list(annotate_with_public_courses(University.objects.not_obsolete().by_score())),
+            "languages": get_courses_per_language(),
+            "courses_count_start_soon": counts['start_soon'],
+            "courses_count_enrollment_ends_soon": counts['enrollment_ends_soon'],
+            "courses_count_new": counts['new'],
+            "courses_count_current": counts['current'],
+        }
+        cache.set(cache_key, summary, CATALOG_SUMMARY_CACHE_TIMEOUT)
+    return summary
 
 
 class FUNCustomFeedGenerator(Rss201rev2Feed):
@@ -59,8 +87,27 @@ class CoursesFeed(Feed):
         site = settings.SITE_NAME
         return protocol, site
 
+    def __call__(self, request, *args, **kwargs):
+        """
+        The feed is rendered once per language and cached until a course
+        changes. Conditional GET requests are supported thanks to the
+        Last-Modified header.
+        """
+        render_feed = super(CoursesFeed, self).__call__
+
+        @last_modified(lambda request, *args, **kwargs: get_courses_last_modified())
+        def cached_feed(request, *args, **kwargs):
+            cache_key = u"courses-feed-{}-{}".format(get_language(), Course.get_catalog_version())
+            response = cache.get(cache_key)
+            if response is None:
+                response = render_feed(request, *args, **kwargs)
+                cache.set(cache_key, response, COURSES_FEED_CACHE_TIMEOUT)
+            return response
+
+        return cached_feed(request, *args, **kwargs)
+
     def items(self, request):
-        return Course.objects.public()
+        return Course.objects.public().with_related()
 
     def item_title(self, course):
         return course.title
@@ -96,3 +143,10 @@ class CoursesFeed(Feed):
             'enrollment_start_date': course.enrollment_start_date.isoformat() if course.enrollment_start_date else '',
             'enrollment_end_date': course.enrollment_end_date.isoformat() if course.enrollment_end_date else '',
         }
+
+
+def get_courses_last_modified():
+    """Return the date of the last catalog update. The catalog version is
+    updated whenever a course, subject or university changes, including when a
+    course is hidden, deactivated or deleted."""
+    return datetime.datetime.fromtimestamp(Course.get_catalog_version(), utc)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CoursesConfig(AppConfig):
+    name = 'courses'
+
+    def ready(self):
+        # Django signal receiver modules must be imported early so that the
+        # signal handling gets registered before any signals need to be sent.
+        from . import signals # pylint: disable=unused-variable
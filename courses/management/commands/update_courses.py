@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
+from multiprocessing.pool import ThreadPool
 import optparse
 import StringIO
 
 from django.core.management.base import BaseCommand
+from django.db import connection
 from django.contrib.auth.models import User
 from django.db.utils import IntegrityError
 from django.template.defaultfilters import slugify
 from django.test import RequestFactory
 
 from easy_thumbnails.exceptions import InvalidImageFormatError
+from easy_thumbnails.source_generators import pil_image
 from easy_thumbnails.files import get_thumbnailer
 
 from opaque_keys import InvalidKeyError
@@ -30,17 +34,34 @@ class CourseHandler(object):
     def __init__(self, course_descriptor):
         self.course_descriptor = course_descriptor
         self.key = unicode(course_descriptor.id)
-        self.course = modulestore().get_course(self.course_descriptor.id)
+        self.course = course_descriptor
+        self._image_data = None
+        self._image_data_loaded = False
+
+    @property
+    def image_data(self):
+        """Content of the course image, read only once from the contentstore."""
+        if not self._image_data_loaded:
+            self._image_data_loaded = True
+            try:
+                asset_location = StaticContent.get_location_from_path(self.image_url)
+                content = contentstore().find(asset_location, as_stream=True)
+                self._image_data = content.copy_to_in_mem().data
+            except (NotFoundError, InvalidKeyError):
+                self._image_data = None
+        return self._image_data
 
     @property
     def memory_image_file(self):
-        try:
-            asset_location = StaticContent.get_location_from_path(self.image_url)
-            content = contentstore().find(asset_location, as_stream=True)
-        except (NotFoundError, InvalidKeyError):
+        if self.image_data is None:
             return None
-        image_file = StringIO.StringIO(content.copy_to_in_mem().data)
-        return image_file
+        return StringIO.StringIO(self.image_data)
+
+    @property
+    def image_hash(self):
+        if self.image_data is None:
+            return ''
+        return hashlib.sha1(self.image_data).hexdigest()
 
     @property
     def title(self):
@@ -69,17 +90,40 @@ class CourseHandler(object):
         return url
 
     def make_thumbnail(self, options):
-        if not self.memory_image_file:
-            return None
-        base_filename = slugify(self.key)
+        return self.make_thumbnails({None: options}).get(None)
+
+    def make_thumbnails(self, options_by_alias):
+        """Generate all thumbnails from a single decoding of the course image.
+
+        Returns:
+            dict: {alias: thumbnail}. Thumbnails that could not be generated
+            are not included.
+        """
+        image_file = self.memory_image_file
+        if image_file is None:
+            return {}
         try:
-            thumbnail = get_thumbnailer(
-                self.memory_image_file,
-                relative_name='courses-thumbnails/{}'.format(base_filename)
-            ).get_thumbnail(options)
-        except InvalidImageFormatError:
-            thumbnail = None
-        return thumbnail
+            image = pil_image(image_file)
+        except IOError:
+            # Invalid image format
+            image = None
+        if image is None:
+            return {}
+        base_filename = slugify(self.key)
+        thumbnailer = get_thumbnailer(
+            image_file,
+            relative_name='courses-thumbnails/{}'.format(base_filename)
+        )
+        # Processors must not modify the decoded image, so that it can be
+        # reused for the next thumbnail
+        thumbnailer.source_generators = [lambda source, **options: image.copy()]
+        thumbnails = {}
+        for alias, options in options_by_alias.items():
+            try:
+                thumbnails[alias] = thumbnailer.get_thumbnail(options)
+            except InvalidImageFormatError:
+                pass
+        return thumbnails
 
     def get_university(self):
         try:
@@ -117,18 +161,42 @@ class Command(BaseCommand):
             dest='course_id',
             default='',
             help='Update only the given course.'),
+        optparse.make_option('--workers',
+            action='store',
+            type='int',
+            dest='workers',
+            default=1,
+            help='Number of courses updated in parallel.'),
     )
 
-    def update_all_courses(self, mongo_courses, assign_universities=False):
+    def update_all_courses(self, mongo_courses, assign_universities=False, workers=1):
         '''
         For each course, we create or update the corresponding
         course in SQL Course table.
         '''
-        for mongo_course in mongo_courses:
-            self.update_course(
-                mongo_course=mongo_course,
-                assign_universities=assign_universities
-            )
+        def update_course(mongo_course):
+            try:
+                self.update_course(
+                    mongo_course=mongo_course,
+                    assign_universities=assign_universities
+                )
+            finally:
+                # Each thread opens its own database connection
+                connection.close()
+
+        if workers > 1:
+            pool = ThreadPool(workers)
+            try:
+                pool.map(update_course, mongo_courses)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for mongo_course in mongo_courses:
+                self.update_course(
+                    mongo_course=mongo_course,
+                    assign_universities=assign_universities
+                )
         self.stdout.write('Number of courses parsed: {}\n'.format(len(mongo_courses)))
         return None
 
@@ -150,21 +218,33 @@ class Command(BaseCommand):
             else:
                 self.stdout.write('\t No university assigned '
                 'to "{}"\n'.format(key))
-        course.is_active = True
-        course.university_display_name = course_handler.university_name
-        course.title = course_handler.title
-        course.image_url = course_handler.image_url
-        thumbnails_info = {}
-        for thumbnail_alias, thumbnails_options in \
-                courses_settings.FUN_THUMBNAIL_OPTIONS.items():
-            thumbnail = course_handler.make_thumbnail(thumbnails_options)
-            if thumbnail:
-                thumbnails_info[thumbnail_alias] = thumbnail.url
-        course.thumbnails_info = thumbnails_info
-        course.start_date = mongo_course.start
-        course.enrollment_start_date = mongo_course.enrollment_start
-        course.enrollment_end_date = mongo_course.enrollment_end
-        course.end_date = mongo_course.end
+        values = {
+            'is_active': True,
+            'university_display_name': course_handler.university_name,
+            'title': course_handler.title,
+            'image_url': course_handler.image_url,
+            'image_hash': course_handler.image_hash,
+            'start_date': mongo_course.start,
+            'enrollment_start_date': mongo_course.enrollment_start,
+            'enrollment_end_date': mongo_course.enrollment_end,
+            'end_date': mongo_course.end,
+        }
+        thumbnails_are_up_to_date = not was_created and course.image_hash == values['image_hash'] \
+            and set(course.thumbnails_info or {}) == set(courses_settings.FUN_THUMBNAIL_OPTIONS)
+        if thumbnails_are_up_to_date and is_up_to_date(course, values):
+            self.stdout.write('Course {} is up to date\n'.format(key))
+            return None
+        if not thumbnails_are_up_to_date:
+            thumbnails = course_handler.make_thumbnails(courses_settings.FUN_THUMBNAIL_OPTIONS)
+            # Thumbnails that could not be generated, for instance because the
+            # course has no image, are stored with an empty url so that they
+            # are not generated again until the image changes
+            course.thumbnails_info = {
+                thumbnail_alias: thumbnails[thumbnail_alias].url if thumbnail_alias in thumbnails else ''
+                for thumbnail_alias in courses_settings.FUN_THUMBNAIL_OPTIONS
+            }
+        for field, value in values.items():
+            setattr(course, field, value)
         course.save()
         del course
         self.stdout.write('Updated course {}\n'.format(key))
@@ -202,5 +282,10 @@ class Command(BaseCommand):
             self.update_all_courses(
                 mongo_courses=courses,
                 assign_universities=assign_universities,
+                workers=options.get('workers') or 1,
             )
             self.deactivate_orphan_courses(courses)
+
+
+def is_up_to_date(course, values):
+    return all(getattr(course, field) == value for field, value in values.items())
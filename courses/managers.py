@@ -43,9 +43,12 @@ class CourseQuerySet(models.query.QuerySet):
         return (now(), self.too_late)
 
     def with_related(self):
+        # Universities of the course-university relations are prefetched, such
+        # that the first university and the university name can be computed
+        # without additional queries.
         queryset = self.prefetch_related(
             'subjects', 'universities',
-            'related_universities',
+            'related_universities__university',
         )
         return queryset
 
@@ -53,20 +56,28 @@ class CourseQuerySet(models.query.QuerySet):
         return self.filter(is_active=True, show_in_catalog=True)
 
     def start_soon(self):
-        return self.public().filter(start_date__range=self.too_late_range())
+        return self.public().filter(self.start_soon_condition())
+
+    def start_soon_condition(self):
+        return Q(start_date__range=self.too_late_range())
 
     def end_soon(self):
         return self.public().filter(end_date__range=self.too_late_range())
 
     def enrollment_ends_soon(self):
-        return self.public().filter(enrollment_end_date__range=self.too_late_range())
+        return self.public().filter(self.enrollment_ends_soon_condition())
+
+    def enrollment_ends_soon_condition(self):
+        return Q(enrollment_end_date__range=self.too_late_range())
 
     def new(self):
         """
         A new course is in its first session and that is not closed.
         """
-        return self.public().filter(
-            Q(session_number=1),
+        return self.public().filter(self.new_condition())
+
+    def new_condition(self):
+        return Q(session_number=1) & (
             Q(enrollment_end_date__gte=now()) | Q(enrollment_end_date__isnull=True)
         )
 
@@ -74,11 +85,38 @@ class CourseQuerySet(models.query.QuerySet):
         """
         A course that is currently opened for enrollment.
         """
-        return self.public().filter(
-            Q(enrollment_start_date__lte=now()) | Q(enrollment_start_date__isnull=True),
-            Q(enrollment_end_date__gte=now()) | Q(enrollment_end_date__isnull=True),
+        return self.public().filter(self.current_condition())
+
+    def current_condition(self):
+        return (
+            (Q(enrollment_start_date__lte=now()) | Q(enrollment_start_date__isnull=True)) &
+            (Q(enrollment_end_date__gte=now()) | Q(enrollment_end_date__isnull=True))
         )
 
+    def public_counts(self):
+        """
+        Count the public courses that start soon, whose enrollment ends soon,
+        that are new and that are current, with a single query.
+
+        Returns:
+            {'start_soon': int, 'enrollment_ends_soon': int, 'new': int, 'current': int}
+        """
+        conditions = {
+            'start_soon': self.start_soon_condition(),
+            'enrollment_ends_soon': self.enrollment_ends_soon_condition(),
+            'new': self.new_condition(),
+            'current': self.current_condition(),
+        }
+        counts = self.public().aggregate(**{
+            name: models.Sum(models.Case(
+                models.When(condition, then=1),
+                default=0, output_field=models.IntegerField()
+            ))
+            for name, condition in conditions.items()
+        })
+        # Sums are None when there are no public courses
+        return {name: count or 0 for name, count in counts.items()}
+
     def annotate_with_is_enrollment_over(self):
         """
         Add a 'is_enrollment_over' attribute to all results.
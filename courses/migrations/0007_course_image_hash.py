@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_default_to_false_for_show_in_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='image_hash',
+            field=models.CharField(help_text='Hash of the course image the thumbnails were generated from', max_length=40, verbose_name='image hash', editable=False, blank=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_image_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='title',
+            field=models.CharField(db_index=True, max_length=255, verbose_name='title', blank=True),
+        ),
+    ]
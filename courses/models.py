@@ -2,6 +2,7 @@
 
 from time import time
 
+from django.core.cache import cache
 from django.db import models
 from django.core.urlresolvers import reverse
 from django.template.defaultfilters import date as django_localize_date
@@ -28,7 +29,7 @@ class Course(models.Model):
     modification_date = models.DateTimeField(_('modification date'), auto_now=True)
     key = models.CharField(max_length=200, verbose_name=_(u'Course key'),
         unique=True)
-    title = models.CharField(_(u'title'), max_length=255, blank=True)
+    title = models.CharField(_(u'title'), max_length=255, blank=True, db_index=True)
     university_display_name = models.CharField(_(u'university display name'),
         max_length=255, blank=True, help_text=_('Displayed in place of the '
         'university name. If not set, use the name of the first associated '
@@ -63,6 +64,8 @@ class Course(models.Model):
     enrollment_end_date = models.DateTimeField(verbose_name=_('enrollment end date'),
         db_index=True, null=True, blank=True)
     thumbnails_info = JSONField(_('thumbnails info'), blank=True, null=True)
+    image_hash = models.CharField(_('image hash'), max_length=40, blank=True,
+        editable=False, help_text=_('Hash of the course image the thumbnails were generated from'))
     certificate_passing_grade = models.FloatField(_('verified certificate passing grade'),
         null=True, blank=True, help_text=(_('Percentage, between 0 and 1')))
 
@@ -70,26 +73,59 @@ class Course(models.Model):
 
     # Cache the courses that have a verified mode. This allows us to write
     # course.has_verified_mode by running just one additional sql query for all
-    # courses. This cache is local to the runtime and should expire frequently.
-    _verified_course_key_strings_cache = [
-        set(), # set of all course_key_string for courses that have a verified mode
-        0      # timestamp at which this cache was last updated
-    ]
-
+    # courses. This cache is shared by all processes and is invalidated
+    # whenever a course mode is saved or deleted (see courses.signals).
+    VERIFIED_COURSE_KEY_STRINGS_CACHE_KEY = 'courses-verified-course-key-strings'
+    VERIFIED_COURSE_KEY_STRINGS_CACHE_TIMEOUT = 60*60
+
+    @classmethod
+    def get_verified_course_key_strings(cls):
+        """Return the set of course key strings for all courses that have a
+        verified mode.
+
+        Callers that need this information for many courses should call this
+        method once and reuse the result.
+        """
+        course_key_strings = cache.get(cls.VERIFIED_COURSE_KEY_STRINGS_CACHE_KEY)
+        if course_key_strings is None:
+            course_key_strings = set([
+                unicode(course_id) for course_id in CourseMode.objects.filter(
+                    mode_slug__in=CourseMode.VERIFIED_MODES
+                ).values_list('course_id', flat=True)
+            ])
+            cache.set(
+                cls.VERIFIED_COURSE_KEY_STRINGS_CACHE_KEY,
+                course_key_strings,
+                cls.VERIFIED_COURSE_KEY_STRINGS_CACHE_TIMEOUT
+            )
+        return course_key_strings
+
+    @classmethod
+    def clear_verified_course_key_strings_cache(cls):
+        cache.delete(cls.VERIFIED_COURSE_KEY_STRINGS_CACHE_KEY)
+
+    # Timestamp of the last modification of catalog data: courses, subjects or
+    # universities (see courses.signals). This is used to invalidate caches
+    # that depend on this data.
+    CATALOG_VERSION_CACHE_KEY = 'courses-catalog-version'
+
+    @classmethod
+    def get_catalog_version(cls):
+        version = cache.get(cls.CATALOG_VERSION_CACHE_KEY)
+        if version is None:
+            version = cls.update_catalog_version()
+        return version
+
+    @classmethod
+    def update_catalog_version(cls):
+        version = time()
+        cache.set(cls.CATALOG_VERSION_CACHE_KEY, version, None)
+        return version
 
     @property
     def has_verified_course_mode(self):
-        """Return True if the course has at least one verified course mode.
-
-        This information is collected from a cache that has an expire period of 10s.
-        """
-        if time() - self._verified_course_key_strings_cache[1] > 10:
-            verified_course_modes = CourseMode.objects.filter(mode_slug__in=CourseMode.VERIFIED_MODES)
-            Course._verified_course_key_strings_cache = (
-                set([unicode(course_mode.course_id) for course_mode in verified_course_modes]),
-                time()
-            )
-        return self.key in Course._verified_course_key_strings_cache[0]
+        """Return True if the course has at least one verified course mode."""
+        return self.key in self.get_verified_course_key_strings()
 
     class Meta:
         ordering = ('-score',)
@@ -123,11 +159,11 @@ class Course(models.Model):
         First university in regard to the order field - that's how allow
         an admin person to decide who's the first / main university.
         '''
-        try:
-            first = self.related_universities.all()[0].university
-        except IndexError:
-            first = None
-        return first
+        # Slicing the related queryset may bypass prefetched relations (see
+        # CourseQuerySet.with_related): instead, we iterate on all relations.
+        for relation in self.related_universities.all():
+            return relation.university
+        return None
 
     @property
     def session_display(self):
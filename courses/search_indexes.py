@@ -1,14 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
+
 from django.conf import settings
 
-from haystack import indexes
+from elasticsearch import TransportError
+from haystack import connections, indexes
 from haystack.backends import elasticsearch_backend
+from haystack.utils import get_identifier
 
 from opaque_keys.edx.keys import CourseKey
-from xmodule.modulestore.django import modulestore
 
+from . import settings as courses_settings
 from .models import Course
+from .utils import get_courses_about_sections
 
 # pylint: disable=W0223
 class ConfigurableElasticBackend(elasticsearch_backend.ElasticsearchSearchBackend):
@@ -37,6 +42,48 @@ class ConfigurableElasticBackend(elasticsearch_backend.ElasticsearchSearchBacken
             mapping.update({field_class.index_fieldname: field_mapping})
         return (content_field_name, mapping)
 
+    def update(self, index, iterable, commit=True):
+        """Indexes that define a prepare_batch method may fetch the data of a
+        whole batch at once and skip the objects that are already up to date.
+        Documents are then sent to Elasticsearch in a single bulk request per
+        batch."""
+        if hasattr(index, 'prepare_batch'):
+            iterable = index.prepare_batch(self, iterable)
+            if not iterable:
+                return
+        super(ConfigurableElasticBackend, self).update(index, iterable, commit=commit)
+
+    def get_stored_fields(self, objects, fields):
+        """Fetch the stored fields of already indexed objects in a single request.
+
+        Returns:
+            dict: {object pk: {field: value}}. Objects that are not indexed yet
+            are not included.
+        """
+        if not self.setup_complete:
+            self.setup()
+        objects_by_identifier = {get_identifier(obj): obj for obj in objects}
+        if not objects_by_identifier:
+            return {}
+        try:
+            response = self.conn.mget(
+                index=self.index_name, doc_type='modelresult',
+                body={'ids': objects_by_identifier.keys()}, fields=fields,
+            )
+        except TransportError:
+            # Index does not exist yet
+            return {}
+        stored_fields = {}
+        for doc in response['docs']:
+            if not doc.get('found'):
+                continue
+            values = {}
+            for field, value in doc.get('fields', {}).items():
+                # Field values are returned as lists
+                values[field] = value[0] if isinstance(value, list) and value else value
+            stored_fields[objects_by_identifier[doc['_id']].pk] = values
+        return stored_fields
+
 
 class ConfigurableElasticSearchEngine(elasticsearch_backend.ElasticsearchSearchEngine):
     backend = ConfigurableElasticBackend
@@ -47,11 +94,70 @@ class CourseIndex(indexes.SearchIndex, indexes.Indexable):
     Course model."""
     text = indexes.CharField(document=True, use_template=True)
 
+    # The following fields are used to filter and sort full-text search
+    # results (see search_course_ids). Faceted fields are not analyzed and
+    # should be queried with their "_exact" suffix.
+    title = indexes.CharField(model_attr='title', faceted=True)
+    level = indexes.CharField(model_attr='level', faceted=True)
+    language = indexes.CharField(model_attr='language', faceted=True)
+    subjects = indexes.MultiValueField(faceted=True)
+    universities = indexes.MultiValueField(faceted=True)
+    score = indexes.IntegerField(model_attr='score')
+    session_number = indexes.IntegerField(model_attr='session_number')
+    start_date = indexes.DateTimeField(model_attr='start_date', null=True)
+    end_date = indexes.DateTimeField(model_attr='end_date', null=True)
+    enrollment_start_date = indexes.DateTimeField(model_attr='enrollment_start_date', null=True)
+    enrollment_end_date = indexes.DateTimeField(model_attr='enrollment_end_date', null=True)
+
+    # Stored fields used to detect courses that need to be reindexed
+    modification_date = indexes.CharField(indexed=False)
+    syllabus_hash = indexes.CharField(indexed=False, null=True)
+
+    def __init__(self, *args, **kwargs):
+        super(CourseIndex, self).__init__(*args, **kwargs)
+        # Course syllabuses of the batch being indexed, fetched in bulk
+        self.syllabuses = {}
+
     def get_model(self):
         return Course
 
     def index_queryset(self, using=None):
-        return self.get_model().objects.public()
+        return self.get_model().objects.public().prefetch_related('subjects', 'universities')
+
+    def prepare_subjects(self, instance):
+        return [subject.slug for subject in instance.subjects.all()]
+
+    def prepare_universities(self, instance):
+        return [university.code for university in instance.universities.all()]
+
+    def prepare_modification_date(self, instance):
+        return instance.modification_date.isoformat()
+
+    def prepare_batch(self, backend, courses):
+        """Fetch the syllabuses of a batch of courses in bulk.
+
+        Returns:
+            list: courses for which the modification date or the syllabus
+            changed since they were last indexed.
+        """
+        courses = list(courses)
+        self.syllabuses = self.get_syllabuses(courses)
+        indexed = backend.get_stored_fields(courses, ['modification_date', 'syllabus_hash'])
+        return [
+            course for course in courses
+            if indexed.get(course.pk) != {
+                'modification_date': self.prepare_modification_date(course),
+                'syllabus_hash': hash_syllabus(self.syllabuses[course.key]),
+            }
+        ]
+
+    def get_syllabuses(self, courses):
+        course_keys = {CourseKey.from_string(course.key): course.key for course in courses}
+        sections = get_courses_about_sections(course_keys.keys(), ['overview'])
+        return {
+            course_keys[course_key]: course_sections.get('overview') or ''
+            for course_key, course_sections in sections.items()
+        }
 
     def prepare(self, instance):
         """As course syllabus is store in Mongo we retrieve it and happend to
@@ -59,11 +165,80 @@ class CourseIndex(indexes.SearchIndex, indexes.Indexable):
         courses/templates/search/indexes/courses/course_text.txt"""
         self.prepared_data = super(CourseIndex, self).prepare(instance)
 
-        usage_key = CourseKey.from_string(instance.key).make_usage_key('about', 'overview')
-        syllabus = modulestore().get_item(usage_key).data
+        syllabus = self.syllabuses.get(instance.key)
+        if syllabus is None:
+            # Course is indexed on its own, outside of a batch
+            syllabus = self.get_syllabuses([instance])[instance.key]
 
         self.prepared_data['text'] += '\n' + syllabus
+        self.prepared_data['syllabus_hash'] = hash_syllabus(syllabus)
         return self.prepared_data
 
     def get_updated_field(self):
         return 'modification_date'
+
+
+def hash_syllabus(syllabus):
+    if isinstance(syllabus, unicode):
+        syllabus = syllabus.encode('utf-8')
+    return hashlib.sha1(syllabus).hexdigest()
+
+
+def search_course_ids(query, filters=None, sort=None, limit=None):
+    """Return the ids of the courses that match a full-text query.
+
+    The ids are fetched from Elasticsearch in a single request, without
+    loading the indexed documents.
+
+    Args:
+        query (unicode): full-text query.
+        filters (list): Elasticsearch filters that matching courses must
+            satisfy. See courses_api.filters.CourseFilter.
+        sort (str): name of the index field by which results should be sorted.
+            Prefix with '-' for descending order. By default, results are sorted
+            by relevance.
+        limit (int): maximum number of results. Defaults to
+            FULL_TEXT_SEARCH_MAX_RESULTS.
+
+    Returns:
+        ids (list of int): ordered course ids.
+    """
+    backend = connections['default'].get_backend()
+    if not backend.setup_complete:
+        backend.setup()
+
+    body = {
+        'query': {
+            'filtered': {
+                'query': {
+                    'simple_query_string': {
+                        'query': query,
+                        'fields': [backend.content_field_name],
+                        'default_operator': 'and',
+                    }
+                },
+                'filter': {
+                    'bool': {
+                        'must': [{'term': {'django_ct': 'courses.course'}}] + (filters or []),
+                    }
+                },
+            }
+        },
+        'fields': ['django_id'],
+        'size': limit or courses_settings.FULL_TEXT_SEARCH_MAX_RESULTS,
+    }
+    if sort:
+        order = 'desc' if sort.startswith('-') else 'asc'
+        body['sort'] = [{sort.lstrip('-'): {'order': order}}, '_score']
+
+    results = backend.conn.search(
+        index=backend.index_name, doc_type='modelresult', body=body
+    )
+    ids = []
+    for hit in results['hits']['hits']:
+        django_id = hit['fields']['django_id']
+        # Field values are returned as lists
+        if isinstance(django_id, list):
+            django_id = django_id[0]
+        ids.append(int(django_id))
+    return ids
@@ -4,6 +4,9 @@ from django.conf import settings
 # Cutoff number of days to consider that a course starts soon or ends soon.
 NUMBER_DAYS_TOO_LATE = getattr(settings, 'NUMBER_DAYS_TOO_LATE', 7)
 
+# Maximum number of courses returned by a full-text search
+FULL_TEXT_SEARCH_MAX_RESULTS = getattr(settings, 'COURSES_FULL_TEXT_SEARCH_MAX_RESULTS', 500)
+
 FUN_THUMBNAIL_OPTIONS = getattr(settings, 'FUN_THUMBNAIL_OPTIONS', {
     'avatar': {'size': (270, 150), 'crop': True},
     'small': {'size': (150, 100), 'crop': 'smart'},
@@ -1,6 +1,11 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from course_modes.models import CourseMode
 from xmodule.modulestore.django import SignalHandler
+from universities.models import University
+
+from .models import Course, CourseSubject, CourseUniversityRelation
 
 
 @receiver(SignalHandler.course_published, dispatch_uid='fun.courses.signals.update_courses')
@@ -13,3 +18,25 @@ def update_course_meta_data_on_studio_publish(sender, course_key, **kwargs):
     # course_key is a CourseKey object and course_id its sting representation
     update_courses_meta_data.delay(course_id=unicode(course_key))
     return 'FUN courses meta data update has been triggered.'
+
+
+@receiver(post_save, sender=CourseMode, dispatch_uid='fun.courses.signals.verified_course_modes_save')
+@receiver(post_delete, sender=CourseMode, dispatch_uid='fun.courses.signals.verified_course_modes_delete')
+def clear_verified_course_key_strings_cache(sender, **kwargs):
+    Course.clear_verified_course_key_strings_cache()
+    Course.update_catalog_version()
+
+
+@receiver(post_save, sender=Course, dispatch_uid='fun.courses.signals.catalog_course_save')
+@receiver(post_delete, sender=Course, dispatch_uid='fun.courses.signals.catalog_course_delete')
+@receiver(post_save, sender=CourseSubject, dispatch_uid='fun.courses.signals.catalog_subject_save')
+@receiver(post_delete, sender=CourseSubject, dispatch_uid='fun.courses.signals.catalog_subject_delete')
+@receiver(post_save, sender=CourseUniversityRelation,
+          dispatch_uid='fun.courses.signals.catalog_relation_save')
+@receiver(post_delete, sender=CourseUniversityRelation,
+          dispatch_uid='fun.courses.signals.catalog_relation_delete')
+@receiver(post_save, sender=University, dispatch_uid='fun.courses.signals.catalog_university_save')
+@receiver(post_delete, sender=University, dispatch_uid='fun.courses.signals.catalog_university_delete')
+@receiver(m2m_changed, sender=Course.subjects.through, dispatch_uid='fun.courses.signals.catalog_subjects_change')
+def update_catalog_version(sender, **kwargs):
+    Course.update_catalog_version()
@@ -3,6 +3,9 @@
 from django.test import TestCase
 from django.utils.timezone import now, timedelta
 
+from course_modes.models import CourseMode
+from opaque_keys.edx.keys import CourseKey
+
 from courses import managers
 from courses import models
 
@@ -59,6 +62,26 @@ class TestCourseSubject(TestCase):
         new_courses = list(models.Course.objects.new())
         self.assertEqual([course_new], new_courses)
 
+    def test_public_counts(self):
+        factories.CourseFactory.create(session_number=1, show_in_catalog=True,
+                                       start_date=now() + timedelta(days=1),
+                                       enrollment_end_date=now() + timedelta(days=2))
+        factories.CourseFactory.create(session_number=2, show_in_catalog=True,
+                                       start_date=now() - timedelta(days=10),
+                                       enrollment_start_date=now() - timedelta(days=20))
+        factories.CourseFactory.create(session_number=1, show_in_catalog=True, is_active=False)
+        with self.assertNumQueries(1):
+            counts = models.Course.objects.public_counts()
+        self.assertEqual({
+            'start_soon': models.Course.objects.start_soon().count(),
+            'enrollment_ends_soon': models.Course.objects.enrollment_ends_soon().count(),
+            'new': models.Course.objects.new().count(),
+            'current': models.Course.objects.current().count(),
+        }, counts)
+        self.assertEqual(1, counts['start_soon'])
+        self.assertEqual(1, counts['new'])
+        self.assertEqual(2, counts['current'])
+
     def test_get_course_language(self):
         course = factories.CourseFactory.create(language="en")
 
@@ -81,6 +104,23 @@ class TestCourseSubject(TestCase):
                 _first_university = course.get_first_university()
                 _university_name = course.university_name
 
+    def test_has_verified_course_mode(self):
+        course_verified = factories.CourseFactory.create(key="org/verified/run")
+        course_honor = factories.CourseFactory.create(key="org/honor/run")
+        CourseMode.objects.create(course_id=CourseKey.from_string(course_honor.key), mode_slug='honor')
+        verified_mode = CourseMode.objects.create(
+            course_id=CourseKey.from_string(course_verified.key), mode_slug='verified'
+        )
+
+        self.assertTrue(course_verified.has_verified_course_mode)
+        self.assertFalse(course_honor.has_verified_course_mode)
+
+        # The shared cache is invalidated when course modes change
+        verified_mode.delete()
+        with self.assertNumQueries(1):
+            self.assertFalse(course_verified.has_verified_course_mode)
+            self.assertFalse(course_honor.has_verified_course_mode)
+
     def test_annotate_with_is_enrollment_over(self):
         yesterday = now() - timedelta(days=1)
         tomorrow = now() + timedelta(days=1)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import mock
+
+from django.test import TestCase
+
+from courses.search_indexes import CourseIndex, hash_syllabus
+
+from . import factories
+
+
+class TestCourseIndex(TestCase):
+
+    def setUp(self):
+        self.index = CourseIndex()
+        self.course1 = factories.CourseFactory(key='course-v1:org+course1+run')
+        self.course2 = factories.CourseFactory(key='course-v1:org+course2+run')
+        self.backend = mock.Mock()
+
+    def prepare_batch(self, syllabuses):
+        def get_sections(course_keys, _fields):
+            return {
+                course_key: {'overview': syllabuses[unicode(course_key)]}
+                for course_key in course_keys
+            }
+        with mock.patch('courses.search_indexes.get_courses_about_sections', side_effect=get_sections):
+            return self.index.prepare_batch(self.backend, [self.course1, self.course2])
+
+    def test_prepare_batch_skips_unchanged_courses(self):
+        self.backend.get_stored_fields.return_value = {
+            self.course1.pk: {
+                'modification_date': self.course1.modification_date.isoformat(),
+                'syllabus_hash': hash_syllabus(u"syllabus 1"),
+            },
+            self.course2.pk: {
+                'modification_date': self.course2.modification_date.isoformat(),
+                'syllabus_hash': hash_syllabus(u"old syllabus 2"),
+            },
+        }
+        courses = self.prepare_batch({
+            self.course1.key: u"syllabus 1",
+            self.course2.key: u"syllabus 2",
+        })
+
+        self.assertEqual([self.course2], courses)
+        self.assertEqual(u"syllabus 2", self.index.syllabuses[self.course2.key])
+
+    def test_prepare_batch_includes_courses_that_were_not_indexed(self):
+        self.backend.get_stored_fields.return_value = {}
+        courses = self.prepare_batch({
+            self.course1.key: u"syllabus 1",
+            self.course2.key: None,
+        })
+
+        self.assertEqual([self.course1, self.course2], courses)
+        self.assertEqual(u"", self.index.syllabuses[self.course2.key])
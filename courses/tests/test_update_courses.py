@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import mock
+
+from django.test import TestCase
+from django.utils.timezone import now, timedelta
+
+from opaque_keys.edx.keys import CourseKey
+
+from courses.management.commands.update_courses import Command, CourseHandler
+from courses.models import Course
+from courses import settings as courses_settings
+
+
+class TestUpdateCourses(TestCase):
+
+    def setUp(self):
+        self.mongo_course = mock.Mock(
+            id=CourseKey.from_string('course-v1:org+course+run'),
+            display_name_with_default=u"Course title",
+            display_organization=u"Org",
+            course_image=u"image.png",
+            org=u"org",
+            start=now().replace(microsecond=0),
+            end=now().replace(microsecond=0) + timedelta(days=30),
+            enrollment_start=None,
+            enrollment_end=None,
+        )
+        self.command = Command()
+        self.command.stdout = mock.Mock()
+        self.image_data = "image"
+        mock_image_data = mock.patch.object(
+            CourseHandler, 'image_data', new_callable=mock.PropertyMock,
+            side_effect=lambda: self.image_data
+        )
+        mock_image_data.start()
+        self.addCleanup(mock_image_data.stop)
+
+    def update_course(self, thumbnails=None):
+        if thumbnails is None:
+            thumbnails = {
+                alias: mock.Mock(url='/thumbnails/' + alias)
+                for alias in courses_settings.FUN_THUMBNAIL_OPTIONS
+            }
+        with mock.patch.object(CourseHandler, 'make_thumbnails', return_value=thumbnails) as make_thumbnails:
+            self.command.update_course(self.mongo_course)
+        return make_thumbnails.call_count
+
+    def test_unchanged_courses_are_skipped(self):
+        self.assertEqual(1, self.update_course())
+        modification_date = Course.objects.get().modification_date
+
+        self.assertEqual(0, self.update_course())
+        self.assertEqual(modification_date, Course.objects.get().modification_date)
+
+    def test_thumbnails_are_regenerated_when_image_changes(self):
+        self.update_course()
+        self.image_data = "new image"
+
+        self.assertEqual(1, self.update_course())
+        self.assertNotEqual('', Course.objects.get().image_hash)
+
+    def test_dates_are_updated_without_regenerating_thumbnails(self):
+        self.update_course()
+        self.mongo_course.end = now().replace(microsecond=0) + timedelta(days=60)
+
+        self.assertEqual(0, self.update_course())
+        self.assertEqual(self.mongo_course.end, Course.objects.get().end_date)
+
+    def test_courses_without_thumbnails_are_skipped(self):
+        self.image_data = None
+        self.assertEqual(1, self.update_course(thumbnails={}))
+        self.assertEqual('', Course.objects.get().get_thumbnail_url('avatar'))
+
+        self.assertEqual(0, self.update_course(thumbnails={}))
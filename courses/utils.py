@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from django.core.cache import cache
 from django.db.models import Count
 
 from courseware.courses import sort_by_announcement
@@ -13,6 +14,10 @@ from .choices import COURSE_LANGUAGES
 from .models import Course
 
 
+# Cache timeout of course about sections, in seconds
+ABOUT_SECTIONS_CACHE_TIMEOUT = 60*60
+
+
 def get_about_section(course_descriptor, field):
     """
     Faster alternative to courseware.courses.get_course_about_section.
@@ -25,6 +30,95 @@ def get_about_section(course_descriptor, field):
         return None
 
 
+def get_courses_about_sections(course_keys, fields):
+    """
+    Fetch the about sections of many courses at once.
+
+    About blocks of courses stored in old-style mongo are fetched with a
+    single query per store; the about blocks of other courses are fetched
+    with a single get_items call per course.
+
+    Args:
+        course_keys (list of CourseKey)
+        fields (list of str): names of the about sections, e.g. "overview".
+
+    Returns:
+        dict: {course_key: {field: data}}; missing sections are not included.
+    """
+    store = modulestore()
+    sections = {course_key: {} for course_key in course_keys}
+    mongo_course_keys = {}
+    for course_key in course_keys:
+        course_store = store._get_modulestore_for_courselike(course_key) # pylint: disable=protected-access
+        if hasattr(course_store, "collection"):
+            mongo_course_keys.setdefault(course_store, []).append(course_key)
+        else:
+            for block in course_store.get_items(course_key, qualifiers={'category': 'about'}):
+                if block.location.name in fields:
+                    sections[course_key][block.location.name] = block.data
+
+    for course_store, store_course_keys in mongo_course_keys.items():
+        course_keys_by_id = {
+            (course_key.org, course_key.course): course_key for course_key in store_course_keys
+        }
+        items = course_store.collection.find(
+            {
+                '_id.category': 'about',
+                '_id.name': {'$in': list(fields)},
+                '_id.revision': None,
+                '$or': [
+                    {'_id.org': org, '_id.course': course} for org, course in course_keys_by_id
+                ],
+            },
+            {'definition.data': True},
+        )
+        for item in items:
+            course_key = course_keys_by_id.get((item['_id']['org'], item['_id']['course']))
+            if course_key is None:
+                continue
+            data = item.get('definition', {}).get('data', {})
+            if isinstance(data, dict):
+                data = data.get('data')
+            sections[course_key][item['_id']['name']] = data
+    return sections
+
+
+def get_cached_courses_about_sections(course_descriptors, fields):
+    """
+    Same as get_courses_about_sections, with results cached per course
+    version: the about sections of a course are refreshed as soon as a new
+    version of the course is published. Courses that are not versioned
+    (old-style mongo courses) may be stale for ABOUT_SECTIONS_CACHE_TIMEOUT
+    seconds.
+
+    Returns:
+        dict: {course_key: {field: data}}
+    """
+    cache_keys = {
+        course.id: u"courses-about-sections-{}-{}-{}".format(
+            course.id, getattr(course, 'course_version', None) or 'unversioned', '-'.join(fields)
+        )
+        for course in course_descriptors
+    }
+    cached = cache.get_many(cache_keys.values())
+    sections = {}
+    missing_course_keys = []
+    for course_key, cache_key in cache_keys.items():
+        if cache_key in cached:
+            sections[course_key] = cached[cache_key]
+        else:
+            missing_course_keys.append(course_key)
+
+    if missing_course_keys:
+        fetched = get_courses_about_sections(missing_course_keys, fields)
+        cache.set_many(
+            {cache_keys[course_key]: course_sections for course_key, course_sections in fetched.items()},
+            ABOUT_SECTIONS_CACHE_TIMEOUT
+        )
+        sections.update(fetched)
+    return sections
+
+
 def sort_courses(courses):
     """Sort courses in a usefull order for user:
         - courses with enrollement date started should be first
@@ -1,7 +1,18 @@
-from rest_framework import viewsets, mixins
+import hashlib
+import json
+from time import time
+
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.translation import get_language
+
+from rest_framework import viewsets, mixins, status
 from rest_framework.authentication import SessionAuthentication, TokenAuthentication
 from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 
 from courses.models import Course
 
@@ -56,6 +67,12 @@ class CourseAPIView(mixins.ListModelMixin,
 
     * Extended list: `/api/courses/?extended_list=True`
 
+    ## Caching
+
+    The public list of courses is cached until courses, subjects or
+    universities are modified. Responses include `ETag` and `Last-Modified`
+    headers, such that clients can perform conditional requests.
+
     '''
     filter_backends = (CourseFilter,)
     authentication_classes = (TokenAuthentication, SessionAuthentication)
@@ -64,6 +81,16 @@ class CourseAPIView(mixins.ListModelMixin,
     max_paginate_by = None
     parser_classes = (JSONParser,)
 
+    # Query parameters that affect the public list of courses. Other
+    # parameters (e.g: jQuery's "_" cache buster) are ignored in cache keys.
+    list_cache_params = (
+        'availability', 'format', 'language', 'level', 'page', 'query', 'rpp',
+        'sort', 'subject', 'university',
+    )
+    # Some filters depend on the current date: cached lists must expire
+    # regularly, even if courses are not modified.
+    list_cache_timeout = 5*60
+
     @property
     def is_admin(self):
         is_admin = self.request.user.is_staff or self.request.user.is_superuser
@@ -88,6 +115,63 @@ class CourseAPIView(mixins.ListModelMixin,
         if self.action in ('retrieve', 'list'):
             return CourseSerializer
 
+    def list(self, request, *args, **kwargs):
+        if self.is_admin:
+            return super(CourseAPIView, self).list(request, *args, **kwargs)
+
+        catalog_version = Course.get_catalog_version()
+        cache_key = self.get_list_cache_key(catalog_version)
+        cached = cache.get(cache_key)
+        if cached is None:
+            response = super(CourseAPIView, self).list(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            content = JSONRenderer().render(response.data)
+            cached = {
+                # Store plain python objects, which can be safely pickled
+                'data': json.loads(content),
+                'etag': '"{}"'.format(hashlib.md5(content).hexdigest()),
+                # The list also depends on the current date, so it may change
+                # without a catalog update: use the rendering time
+                'last_modified': int(time()),
+            }
+            cache.set(cache_key, cached, self.list_cache_timeout)
+
+        if self.is_not_modified(request, cached['etag'], cached['last_modified']):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(cached['data'])
+        response['ETag'] = cached['etag']
+        response['Last-Modified'] = http_date(cached['last_modified'])
+        # Serialized courses contain localized texts and dates
+        patch_vary_headers(response, ['Accept-Language', 'Cookie'])
+        return response
+
+    def get_list_cache_key(self, catalog_version):
+        params = sorted(
+            (key, sorted(self.request.query_params.getlist(key)))
+            for key in self.list_cache_params
+            if key in self.request.query_params
+        )
+        params_hash = hashlib.md5(json.dumps(params)).hexdigest()
+        # Serialized courses contain localized texts and dates
+        return 'courses-api-list-{}-{}-{}'.format(get_language(), catalog_version, params_hash)
+
+    @staticmethod
+    def is_not_modified(request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            etags = [value.strip() for value in if_none_match.split(',')]
+            return etag in etags or '*' in etags
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    def get_serializer_context(self):
+        context = super(CourseAPIView, self).get_serializer_context()
+        if self.action == 'list':
+            context['verified_course_key_strings'] = Course.get_verified_course_key_strings()
+        return context
+
     def get_queryset(self):
         if not (self.is_admin and self.extended_list):
             queryset = Course.objects.with_related().public()
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from django.db.models import Case, IntegerField, When
+from django.utils.timezone import now
+
 from rest_framework import filters
 
-from haystack.query import SearchQuerySet
+from courses.models import Course
+from courses.search_indexes import search_course_ids
 
 
 class CourseFilter(filters.BaseFilterBackend):
@@ -20,6 +24,55 @@ class CourseFilter(filters.BaseFilterBackend):
                 return sort_param
         return '-score'
 
+    def search_sort_field(self, request):
+        """Get the name of the search index field matching the "sort" parameter
+
+        Returns:
+            str: None when results should be sorted by relevance.
+        """
+        sort = self.order_by_param(request)
+        if sort.lstrip('-') == 'score':
+            return None
+        if sort.lstrip('-') == 'title':
+            # Analyzed fields cannot be used for sorting
+            return sort + '_exact'
+        return sort
+
+    def search_filters(self, request):
+        """Convert the request parameters to search index filters.
+
+        Returns:
+            list: Elasticsearch filters to be passed to search_course_ids.
+        """
+        clauses = []
+        for param, field in (
+                ('university', 'universities_exact'),
+                ('subject', 'subjects_exact'),
+                ('level', 'level_exact'),
+                ('language', 'language_exact'),
+        ):
+            values = request.query_params.getlist(param)
+            if values:
+                clauses.append({'terms': {field: values}})
+
+        availability = request.query_params.getlist('availability')
+        current_time = now().isoformat()
+        too_late = Course.objects.all().too_late.isoformat()
+        for param, field in (
+                ('start-soon', 'start_date'),
+                ('end-soon', 'end_date'),
+                ('enrollment-ends-soon', 'enrollment_end_date'),
+        ):
+            if param in availability:
+                clauses.append({'range': {field: {'gte': current_time, 'lte': too_late}}})
+        if 'new' in availability:
+            clauses.append({'term': {'session_number': 1}})
+        if 'new' in availability or 'current' in availability:
+            clauses.append(date_or_missing_filter('enrollment_end_date', 'gte', current_time))
+        if 'current' in availability:
+            clauses.append(date_or_missing_filter('enrollment_start_date', 'lte', current_time))
+        return clauses
+
     def filter_queryset(self, request, queryset, view):
         university_codes = request.query_params.getlist('university')
         subject_slugs = request.query_params.getlist('subject')
@@ -47,11 +100,38 @@ class CourseFilter(filters.BaseFilterBackend):
         if 'current' in availability:
             queryset = queryset.current()
         if full_text_query:
-            results = SearchQuerySet().filter(content=full_text_query)
-            queryset = queryset.filter(pk__in=[item.pk for item in results.filter(django_ct='courses.course')])
+            # Matching course ids are fetched in a single, bounded request to
+            # the search index. Filters and sorting are applied by the index
+            # too, so that the most relevant courses are not cut off.
+            ids = search_course_ids(
+                full_text_query,
+                filters=self.search_filters(request),
+                sort=self.search_sort_field(request),
+            )
+            if not ids:
+                return queryset.none()
+            # Keep the order of the search results, which are either sorted
+            # by relevance or by the requested field
+            queryset = queryset.filter(pk__in=ids).annotate(search_position=Case(
+                *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+                output_field=IntegerField()
+            ))
+            order_by = 'search_position'
+        else:
+            order_by = self.order_by_param(request)
 
         # Put courses for which enrollment is over at the end
         queryset = queryset.annotate_with_is_enrollment_over()
-        queryset = queryset.order_by('is_enrollment_over', self.order_by_param(request))
+        queryset = queryset.order_by('is_enrollment_over', order_by)
 
         return queryset
+
+
+def date_or_missing_filter(field, operator, value):
+    """Filter on a date range, including documents for which the date is not defined."""
+    return {
+        'or': [
+            {'range': {field: {operator: value}}},
+            {'missing': {'field': field}},
+        ]
+    }
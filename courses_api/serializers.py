@@ -78,7 +78,12 @@ class CourseSerializer(serializers.ModelSerializer):
         return self.university_serializer_class(instance=main_university).data
 
     def get_has_verified_course_mode(self, obj):
-        return obj.has_verified_course_mode
+        # When serializing a list of courses, the set of verified courses is
+        # fetched once by the view and passed in the context.
+        verified_course_key_strings = self.context.get('verified_course_key_strings')
+        if verified_course_key_strings is None:
+            return obj.has_verified_course_mode
+        return obj.key in verified_course_key_strings
 
 class PrivateCourseSerializer(CourseSerializer):
     '''
@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
 
 import json
+import mock
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
 from django.utils.timezone import now, timedelta
+from django.utils.translation import get_language
 
 from student.tests.factories import UserFactory
 
 
 from courses import choices as courses_choices
-from courses.models import CourseUniversityRelation
+from courses.models import Course, CourseUniversityRelation
 from courses.tests.factories import CourseFactory, CourseSubjectFactory
 
 from fun.tests.utils import skipUnlessLms
@@ -397,3 +403,126 @@ class CourseAPITest(TestCase):
         self.assertEqual(2, data["count"])
         self.assertEqual(self.active_2.id, data["results"][0]["id"])
         self.assertEqual(self.active_1.id, data["results"][1]["id"])
+
+    def test_public_list_is_cached_until_courses_change(self):
+        self.client.get(self.api_url, {'sort': 'title', '_': '1'})
+        # Queryset updates do not send signals, so the cache is not invalidated
+        Course.objects.filter(id=self.active_1.id).update(title='updated title')
+        response = self.client.get(self.api_url, {'_': '2', 'sort': 'title'})
+        self.assertContains(response, self.active_1.title)
+        self.assertNotContains(response, 'updated title')
+
+        self.active_1.title = 'modified title'
+        self.active_1.save()
+        response = self.client.get(self.api_url, {'sort': 'title'})
+        self.assertContains(response, 'modified title')
+
+    def test_public_list_is_cached_per_language(self):
+        with mock.patch.object(Course, 'session_display', new_callable=mock.PropertyMock,
+                               side_effect=get_language):
+            response_fr = self.client.get(self.api_url, HTTP_ACCEPT_LANGUAGE='fr')
+            response_en = self.client.get(self.api_url, HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual('fr', json.loads(response_fr.content)['results'][0]['session_display'])
+        self.assertEqual('en', json.loads(response_en.content)['results'][0]['session_display'])
+        self.assertNotEqual(response_fr['ETag'], response_en['ETag'])
+
+    def test_public_list_conditional_requests(self):
+        response = self.client.get(self.api_url)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+
+        self.assertEqual(304, self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag).status_code)
+        self.assertEqual(304, self.client.get(
+            self.api_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code)
+        self.assertEqual(200, self.client.get(self.api_url, HTTP_IF_NONE_MATCH='"other"').status_code)
+
+        UniversityFactory(code='new-university')
+        self.assertEqual(200, self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag).status_code)
+
+    def test_public_list_last_modified_is_the_rendering_time(self):
+        with mock.patch('courses_api.api.time', return_value=1000):
+            response = self.client.get(self.api_url)
+        # Date-dependent filters change the list when the cached entry expires
+        cache.clear()
+        with mock.patch('courses_api.api.time', return_value=2000):
+            response = self.client.get(
+                self.api_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(http_date(2000), response['Last-Modified'])
+
+    def test_full_text_search_filters_and_sorts_in_search_index(self):
+        with mock.patch('courses_api.filters.search_course_ids',
+                        return_value=[self.active_2.id, self.not_active.id]) as mock_search:
+            response = self.client.get(self.api_url, {
+                'query': 'active', 'language': 'fr', 'availability': 'new', 'sort': '-title',
+            })
+        data = json.loads(response.content)
+
+        self.assertEqual([self.active_2.id], [course['id'] for course in data['results']])
+        mock_search.assert_called_once_with('active', filters=mock.ANY, sort='-title_exact')
+        search_filters = mock_search.call_args[1]['filters']
+        self.assertIn({'terms': {'language_exact': ['fr']}}, search_filters)
+        self.assertIn({'term': {'session_number': 1}}, search_filters)
+
+    def test_full_text_search_sorted_by_relevance(self):
+        with mock.patch('courses_api.filters.search_course_ids', return_value=[]) as mock_search:
+            response = self.client.get(self.api_url, {'query': 'active'})
+        self.assertEqual(0, json.loads(response.content)['count'])
+        mock_search.assert_called_once_with('active', filters=[], sort=None)
+
+    def test_full_text_search_keeps_search_index_order(self):
+        self.active_1.score = 10
+        self.active_1.save()
+        with mock.patch('courses_api.filters.search_course_ids',
+                        return_value=[self.active_2.id, self.active_1.id]):
+            response = self.client.get(self.api_url, {'query': 'active', 'sort': 'score'})
+        data = json.loads(response.content)
+        self.assertEqual([self.active_2.id, self.active_1.id], [course['id'] for course in data['results']])
+
+
+@skipUnlessLms
+class CourseAPIQueriesTest(TestCase):
+
+    def create_courses(self, count):
+        """Create public courses, each associated to a university and a subject."""
+        university = UniversityFactory()
+        subject = CourseSubjectFactory()
+        first_id = Course.objects.count()
+        Course.objects.bulk_create([
+            Course(
+                key='test/queries-{}/run'.format(first_id + index),
+                title='course {}'.format(first_id + index),
+                show_in_catalog=True,
+                is_active=True,
+            ) for index in range(count)
+        ])
+        courses = Course.objects.filter(universities=None)
+        CourseUniversityRelation.objects.bulk_create([
+            CourseUniversityRelation(course=course, university=university)
+            for course in courses
+        ])
+        Course.subjects.through.objects.bulk_create([
+            Course.subjects.through(course=course, coursesubject=subject)
+            for course in courses
+        ])
+
+    def count_list_queries(self, page_size):
+        url = reverse('fun-courses-api:courses-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'rpp': page_size})
+        self.assertEqual(page_size, len(json.loads(response.content)['results']))
+        return len(queries)
+
+    def test_number_of_queries_does_not_depend_on_page_size(self):
+        query_counts = []
+        for page_size in (10, 100, 1000):
+            self.create_courses(page_size - Course.objects.count())
+            # Warm up caches
+            self.count_list_queries(page_size)
+            # ...but not the cached list, which would hide the list queries
+            Course.update_catalog_version()
+            query_counts.append(self.count_list_queries(page_size))
+
+        self.assertEqual(1, len(set(query_counts)), query_counts)
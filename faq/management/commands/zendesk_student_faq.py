@@ -14,7 +14,10 @@ from optparse import make_option
 
 from django.core.management.base import BaseCommand
 
-from ...utils import connect_and_drop_collection, COLLECTION
+from ...utils import (
+    build_article_tree, clear_article_tree_cache, connect_and_drop_collection,
+    COLLECTION, TREE_COLLECTION
+)
 
 
 logger = logging.getLogger(__name__)
@@ -71,6 +74,7 @@ class Command(BaseCommand):
             return
 
         collection = connect_and_drop_collection(COLLECTION)
+        items = []
 
         categories = self._query_zendesk('/api/v2/help_center/categories.json')
 
@@ -114,9 +118,20 @@ class Command(BaseCommand):
                         'last_document_update': last_document_update,  # This is the lastest document update
                     }
 
+                    items.append(item)
                     if not options['dry_run']:
                         collection.insert(item)
 
+        if not options['dry_run']:
+            # Articles are fetched by id, and the FAQ index is rendered from a
+            # single tree document
+            collection.create_index('id')
+            connect_and_drop_collection(TREE_COLLECTION).insert({
+                'categories': build_article_tree(items),
+                'last_update': timezone.now(),
+            })
+            clear_article_tree_cache()
+
         self.log('\n\n%d categories %d sections, %d articles\n' % (
                 collection.count(),
                 len(list(collection.distinct('category'))),
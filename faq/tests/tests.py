@@ -2,14 +2,18 @@
 
 from bs4 import BeautifulSoup
 import datetime
+import mock
 
+from django.core.cache import cache
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
 
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from fun.tests.utils import skipUnlessLms
 
-from ..utils import connect_to_mongo, COLLECTION
+from ..management.commands.zendesk_student_faq import Command
+from ..utils import connect_to_mongo, get_article_tree, COLLECTION, TREE_COLLECTION
 
 now = datetime.datetime.now()
 article = {
@@ -28,8 +32,10 @@ article = {
 class FAQTest(ModuleStoreTestCase):
     def setUp(self):
         super(FAQTest, self).setUp()
+        cache.clear()
         db = connect_to_mongo()
-        db[COLLECTION].insert(article)
+        db.drop_collection(TREE_COLLECTION)
+        db[COLLECTION].insert(dict(article))
 
     def test_faq_index(self):
         response = self.client.get(reverse('faq:index'))
@@ -60,3 +66,32 @@ class FAQTest(ModuleStoreTestCase):
         self.assertEqual(u"Aide", breadcrumbs[1].text.strip())
         self.assertEqual(u"Category name 1", breadcrumbs[2].text.strip())
         self.assertEqual(u"Section 1", breadcrumbs[3].text.strip())
+
+    def test_article_tree_is_cached(self):
+        tree = get_article_tree()
+        self.assertEqual(u"Article 1", tree[0]['sections'][0]['articles'][0]['name'])
+        connect_to_mongo()[COLLECTION].remove({})
+        self.assertEqual(tree, get_article_tree())
+
+    def test_import_writes_article_tree(self):
+        responses = {
+            '/api/v2/help_center/categories.json': {'categories': [
+                {'id': 2, 'name': u"Category 2", 'position': 1},
+            ]},
+            '/api/v2/help_center/categories/2/sections.json': {'sections': [
+                {'id': 3, 'name': u"Section 3", 'position': 1},
+            ]},
+            '/api/v2/help_center/sections/3/articles.json': {'articles': [
+                {'id': 4, 'name': u"Article 4", 'body': u"Body 4", 'updated_at': '2016-01-01T00:00:00Z'},
+                {'id': 5, 'name': u"Article 5", 'body': u"Body 5", 'updated_at': '2016-01-02T00:00:00Z'},
+            ]},
+        }
+        with self.settings(ZENDESK_USERNAME='username', ZENDESK_TOKEN='token'):
+            with mock.patch.object(Command, '_query_zendesk', side_effect=lambda url: responses[url]):
+                call_command('zendesk_student_faq')
+
+        tree = connect_to_mongo()[TREE_COLLECTION].find_one()['categories']
+        self.assertEqual(1, len(tree))
+        self.assertEqual(u"Section 3", tree[0]['sections'][0]['name'])
+        self.assertEqual([4, 5], [a['id'] for a in tree[0]['sections'][0]['articles']])
+        self.assertEqual(u"Article 5", get_article_tree()[0]['sections'][0]['articles'][1]['name'])
@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 
 from django.conf import settings
+from django.core.cache import cache
 from fun.utils.mongo import connect_to_mongo
 
 MONGO = settings.CONTENTSTORE['DOC_STORE_CONFIG']
 
 COLLECTION = 'zendesk_student_faq_articles'
+# Single document holding the categories, sections and articles tree
+TREE_COLLECTION = 'zendesk_student_faq_tree'
+
+# The article tree is cached until the FAQ is imported again
+ARTICLE_TREE_CACHE_KEY = 'faq-article-tree'
+ARTICLE_TREE_CACHE_TIMEOUT = 60*60
 
 
 def connect_and_drop_collection(collection):
@@ -18,3 +25,59 @@ def connect_and_drop_collection(collection):
 def get_fun_faq_collection():
     db = connect_to_mongo()
     return db[COLLECTION]
+
+
+def get_fun_faq_tree_collection():
+    db = connect_to_mongo()
+    return db[TREE_COLLECTION]
+
+
+def build_article_tree(articles):
+    """Group FAQ articles by category and section, in the order they come in.
+
+    Returns:
+        list of categories, each with a list of 'sections', each with a list
+        of 'articles'.
+    """
+    categories = []
+    categories_by_id = {}
+    sections_by_id = {}
+    for article in articles:
+        category = categories_by_id.get(article['category']['id'])
+        if category is None:
+            category = dict(article['category'], sections=[])
+            categories_by_id[category['id']] = category
+            categories.append(category)
+        section = sections_by_id.get(article['section']['id'])
+        if section is None:
+            section = dict(article['section'], articles=[])
+            sections_by_id[section['id']] = section
+            category['sections'].append(section)
+        section['articles'].append({
+            'id': article['id'],
+            'name': article['name'],
+            'last_document_update': article['last_document_update'],
+        })
+    return categories
+
+
+def get_article_tree():
+    """Return the FAQ article tree, as written by the zendesk_student_faq
+    command. The tree is built from the articles if it has not been written
+    yet."""
+    article_tree = cache.get(ARTICLE_TREE_CACHE_KEY)
+    if article_tree is None:
+        document = get_fun_faq_tree_collection().find_one()
+        if document is not None:
+            article_tree = document['categories']
+        else:
+            article_tree = build_article_tree(get_fun_faq_collection().find(
+                {}, {'_id': False, 'id': True, 'name': True, 'category': True,
+                     'section': True, 'last_document_update': True}
+            ))
+        cache.set(ARTICLE_TREE_CACHE_KEY, article_tree, ARTICLE_TREE_CACHE_TIMEOUT)
+    return article_tree
+
+
+def clear_article_tree_cache():
+    cache.delete(ARTICLE_TREE_CACHE_KEY)
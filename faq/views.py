@@ -3,17 +3,11 @@
 from django.http import Http404
 from django.shortcuts import render
 
-from .utils import get_fun_faq_collection
+from .utils import get_article_tree, get_fun_faq_collection
 
 
 def index(request):
-    # Query mongo to build faq structure
-    faq = get_fun_faq_collection()
-    article_tree = faq.distinct('category')
-    for category in article_tree:
-        category['sections'] = faq.find({'category.id': category['id']}).distinct('section')
-        for section in category['sections']:
-            section['articles'] = faq.find({'section.id': section['id']})
+    article_tree = get_article_tree()
 
     return render(request, 'faq/faq.html', {
         'article_tree': article_tree,
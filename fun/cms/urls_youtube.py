@@ -6,4 +6,5 @@ urlpatterns = patterns('fun.cms.views.youtube',
     url(r'^subtitles/(?P<subtitle_id>{})$'.format(SUBTITLE_ID_PATTERN),
         'download_subtitle', name='download_subtitle'),
     url(r'^upload_video$', 'upload_video', name='upload_video'),
+    url(r'^upload_video/(?P<upload_id>[0-9a-f]+)$', 'upload_progress', name='upload_progress'),
 )
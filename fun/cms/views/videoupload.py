@@ -16,6 +16,10 @@ from fun.utils import get_course
 from videoproviders.api import get_client, MissingCredentials, ClientError
 from videoproviders.forms import SubtitleForm, ThumbnailForm
 from videoproviders.models import VideoUploaderDeactivationPeriod
+from videoproviders.tasks import warm_course_subtitles_cache
+
+
+MAX_VIDEOS_PAGE_SIZE = 200
 
 
 def catch_missing_credentials_error(view_func):
@@ -58,13 +62,23 @@ def home(request, course_key_string):
 @has_write_access_to_course
 @catch_missing_credentials_error
 def get_videos(request, course_key_string):
+    """Return a single page of uploaded videos, along with the total video
+    count and the token to be passed to fetch the next page."""
     api_client = get_client(course_key_string)
+    page_token = request.GET.get("page_token") or None
+    try:
+        page_size = int(request.GET.get("page_size", api_client.VIDEOS_PAGE_SIZE))
+    except ValueError:
+        page_size = api_client.VIDEOS_PAGE_SIZE
+    page_size = max(1, min(page_size, MAX_VIDEOS_PAGE_SIZE))
 
-    # Get list of uploaded videos
+    # Get page of uploaded videos
     try:
-        videos = api_client.get_videos()
+        page = api_client.get_videos_page(page_token=page_token, page_size=page_size)
         return JsonResponse({
-            "videos": videos
+            "videos": page["videos"],
+            "count": page["count"],
+            "next_page_token": page["next_page_token"],
         })
     except ClientError as e:
         return json_error_response(_("Could not fetch video list:"), e.message)
@@ -167,6 +181,9 @@ def video_subtitles(request, course_key_string, video_id):
                     form.cleaned_data["uploaded_file"],
                     form.cleaned_data["language"],
                 )
+                warm_course_subtitles_cache.delay(
+                    course_key_string, video_ids=[form.cleaned_data["video_id"]]
+                )
                 return JsonResponse({})
             except ClientError as e:
                 return json_error_response(_("Could not add subtitles:"), e.message)
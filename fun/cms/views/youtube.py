@@ -1,5 +1,7 @@
+from django.core.urlresolvers import reverse
 from django.http import HttpResponse, Http404
-from videoproviders.api.youtube import Client
+from videoproviders.api.youtube import Client, VideoUpload
+from videoproviders.tasks import upload_youtube_video
 
 from ..utils.views import has_write_access_to_course
 from util.json_request import JsonResponse
@@ -13,11 +15,39 @@ def download_subtitle(request, course_key_string, subtitle_id):
 
 @has_write_access_to_course
 def upload_video(request, course_key_string):
+    """
+    Spool the uploaded video file and hand it off to a celery worker for
+    upload to Youtube. The browser should then poll the returned progress url.
+    """
     file_obj = request.FILES.get(Client.FILE_PARAMETER_NAME)
     if not file_obj:
         raise Http404
 
-    client = Client(course_key_string)
-    result = client.upload_video(file_obj)
+    upload = VideoUpload.create(course_key_string, file_obj)
+    upload_youtube_video.delay(upload.upload_id)
+
+    return JsonResponse({
+        "upload_id": upload.upload_id,
+        "progress_url": reverse("youtube:upload_progress", kwargs={
+            "course_key_string": course_key_string,
+            "upload_id": upload.upload_id,
+        }),
+    })
+
+
+@has_write_access_to_course
+def upload_progress(request, course_key_string, upload_id):
+    state = VideoUpload(upload_id).get()
+    if state is None or state['course_key_string'] != course_key_string:
+        raise Http404
 
+    result = {
+        "status": state['status'],
+        "progress": state['progress'],
+    }
+    if state['status'] == 'uploaded':
+        # This object will be passed to the create_video handler
+        result["id"] = state['video_id']
+    elif state['status'] == 'error':
+        result["error"] = state['error']
     return JsonResponse(result)
@@ -243,6 +243,16 @@ def ensure_directory_exists(directory):
 ensure_directory_exists(ORA2_FILEUPLOAD_ROOT)
 ensure_directory_exists(ORA2_FILEUPLOAD_CACHE_ROOT)
 
+# Content-addressed store of converted video subtitles
+SUBTITLES_STORE_ROOT = os.path.join(SHARED_ROOT, "video_subtitles_store")
+SUBTITLES_STORE_MAX_BYTES = 500*1024*1024
+ensure_directory_exists(SUBTITLES_STORE_ROOT)
+
+# Video files are spooled here before being uploaded to Youtube by a celery
+# worker
+YOUTUBE_UPLOAD_ROOT = os.path.join(SHARED_ROOT, "youtube_uploads")
+ensure_directory_exists(YOUTUBE_UPLOAD_ROOT)
+
 # Caches
 def default_cache_configuration(key_prefix):
     return {
@@ -2,10 +2,16 @@
 """Middleware to enforce legal acceptance when new
 conditions are published"""
 
+from collections import OrderedDict
 import re
+
 from django.conf import settings
 from django.shortcuts import redirect
-from payment.models import legal_acceptance
+from payment.models import get_latest_terms_id, legal_acceptance
+
+## Id of the latest terms accepted by the user, saved in the session so that
+## compliance is not checked against the database on each request
+ACCEPTED_TERMS_SESSION_KEY = "legal_acceptance_terms_id"
 
 DEFAULT_AGREEMENT_WHITELIST = map(
     re.compile,
@@ -54,21 +60,50 @@ def terms_accepted(func):
             return func(request, *args, **kwargs)
     return wrapped
 
+def combine_patterns(patterns):
+    """Compile a list of regexes (compiled or not) into as few regexes as
+    possible. Flags apply to a whole regex, so patterns are joined into a
+    single regex per set of flags.
+
+    Returns:
+        list of compiled regexes: one of them matches whenever any of the
+        patterns matches
+    """
+    patterns_by_flags = OrderedDict()
+    for pattern in patterns:
+        pattern = re.compile(pattern)
+        patterns_by_flags.setdefault(pattern.flags, []).append(pattern.pattern)
+    return [
+        re.compile("|".join("(?:%s)" % pattern for pattern in flag_patterns), flags)
+        for flags, flag_patterns in patterns_by_flags.items()
+    ]
+
 class LegalAcceptance(object):
     def __init__(self, *a, **kw):
-        self.white_list = get(
+        self.white_lists = combine_patterns(get(
             settings,
             "AGREEMENT_WHITELIST",
             DEFAULT_AGREEMENT_WHITELIST
-        )
+        ))
 
     def is_whitelisted(self, url):
-        return any(wl_url.match(url) for wl_url in self.white_list)
+        return any(white_list.match(url) is not None for white_list in self.white_lists)
+
+    def has_accepted_latest_terms(self, request):
+        latest_terms_id = get_latest_terms_id()
+        if latest_terms_id is None:
+            return True
+        if request.session.get(ACCEPTED_TERMS_SESSION_KEY) == latest_terms_id:
+            return True
+        if legal_acceptance(request.user):
+            request.session[ACCEPTED_TERMS_SESSION_KEY] = latest_terms_id
+            return True
+        return False
 
     def process_view(self, request, view_func, view_args, view_kwargs):
         if not self.is_whitelisted(request.path_info) \
             and hasattr(request, "user") \
-            and request.user.is_authenticated and \
-            not legal_acceptance(request.user):
+            and request.user.is_authenticated() and \
+            not self.has_accepted_latest_terms(request):
             return terms_accepted(view_func)(request, *view_args, **view_kwargs)
 
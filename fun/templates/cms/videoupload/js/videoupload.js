@@ -116,7 +116,19 @@ require(["jquery", "underscore", "backbone", "gettext",
         if (data.error) {
           this.trigger("syncError", data.error);
         }
+        this.count = data.count;
+        this.nextPageToken = data.next_page_token;
         return data.videos;
+      },
+
+      fetchNextPage: function() {
+        // Videos are served one page at a time; returns false when all pages
+        // have been fetched.
+        if (!this.nextPageToken) {
+          return false;
+        }
+        this.fetch({remove: false, data: {page_token: this.nextPageToken}});
+        return true;
       }
     });
 
@@ -315,6 +327,11 @@ require(["jquery", "underscore", "backbone", "gettext",
 
       synced: function(model_or_collection) {
         if (model_or_collection === this.collection) {
+            if (this.collection.fetchNextPage()) {
+                this.sort();
+                this.render();
+                return this;
+            }
             this.$(".syncing").hide();
             this.$(".synced").show();
             this.sort();
@@ -449,6 +466,9 @@ require(["jquery", "underscore", "backbone", "gettext",
             success: function(data) {
               if (data.error) {
                 video.setError(data.error)
+              } else if (data.progress_url) {
+                // The upload to the video provider happens in the background
+                that.pollUploadProgress(video, data.progress_url);
               } else {
                 video.setStatus("uploaded", data);
               }
@@ -459,6 +479,24 @@ require(["jquery", "underscore", "backbone", "gettext",
           });
         });
       },
+
+      pollUploadProgress: function(video, progressUrl) {
+        var that = this;
+        $.getJSON(progressUrl, function(data) {
+          if (data.status === "error") {
+            video.setError(data.error);
+          } else if (data.status === "uploaded") {
+            video.setStatus("uploaded", {id: data.id});
+          } else {
+            video.trigger("uploading-progress", data.progress);
+            setTimeout(function() {
+              that.pollUploadProgress(video, progressUrl);
+            }, 2000);
+          }
+        }).fail(function(jqXHR, textStatus, errorThrown) {
+          video.setError(errorThrown);
+        });
+      },
     });
 
     var Subtitle = Backbone.Model.extend({
@@ -2,18 +2,19 @@ import csv
 from datetime import datetime
 from StringIO import StringIO
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 
 
-def csv_response(header_row, data_rows, filename):
-    def encode_data(data):
-        if isinstance(data, unicode):
-            return data.encode('utf-8')
-        elif isinstance(data, datetime):
-            return data.strftime('%Y/%m/%d')
-        else:
-            return u"{}".format(data)
+def encode_data(data):
+    if isinstance(data, unicode):
+        return data.encode('utf-8')
+    elif isinstance(data, datetime):
+        return data.strftime('%Y/%m/%d')
+    else:
+        return u"{}".format(data)
+
 
+def csv_response(header_row, data_rows, filename):
     response_content = StringIO()
     writer = csv.writer(response_content)
     writer.writerow([field.encode('utf-8') for field in header_row])
@@ -24,3 +25,25 @@ def csv_response(header_row, data_rows, filename):
     response = HttpResponse(response_content.read(), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
     return response
+
+
+class Echo(object):
+    """File-like object that returns the written value, to be used by csv writers."""
+
+    def write(self, value):
+        return value
+
+
+def csv_streaming_response(header_row, data_rows, filename):
+    """Same as csv_response, except that rows are written to the response as
+    soon as they are generated, such that data_rows can be a generator."""
+    writer = csv.writer(Echo())
+
+    def iter_lines():
+        yield writer.writerow([field.encode('utf-8') for field in header_row])
+        for data_row in data_rows:
+            yield writer.writerow([encode_data(d) for d in data_row])
+
+    response = StreamingHttpResponse(iter_lines(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+    return response
@@ -1,11 +1,20 @@
 # -*- coding: utf-8 -*-
 
-from django.utils.translation import ugettext as _
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db.models import Count, Max
+from django.utils.translation import ugettext as _, get_language
 
 from course_wiki.utils import course_wiki_slug
 
 TEMPLATE = u'<li><a href="{link}" target="_blank">{title}</a> <span class="{state}">({revisions} {date})</span></li>'
 
+# Rendered page trees are cached until the wiki is modified
+HTML_TREE_CACHE_TIMEOUT = 24*60*60
+
 
 def get_base_page(course):
     """Returns course base wiki page.
@@ -34,18 +43,46 @@ def count_articles(course):
     return count
 
 def get_page_tree(pages):
-    """Recursively build a tree of pages.
+    """Build a tree of pages.
+       The subtree of each page is loaded with a single MPTT range query. Pages
+       are annotated with their revision count and path, and their article and
+       current revision are loaded too, such that the tree can be rendered
+       without additional queries.
         Args:    list of pages (URLPath)
-        Returns: list of pages (URLPath)
+        Returns: list of pages (URLPath), each page being followed by the list
+                 of its children, if any
     """
     import wiki.models.urlpath
 
-    for idx, child in enumerate(pages):
-        if isinstance(child, wiki.models.urlpath.URLPath):
-            children = get_page_tree(list(child.get_children()))
-            if children:
-                pages.insert(idx + 1, children)
-    return pages
+    tree = []
+    for page in pages:
+        if not isinstance(page, wiki.models.urlpath.URLPath):
+            tree.append(page)
+            continue
+        descendants = list(
+            page.get_descendants(include_self=True)
+            .select_related('article', 'article__current_revision')
+            .annotate(revision_count=Count('article__articlerevision'))
+            .order_by('lft')
+        )
+        children = defaultdict(list)
+        for descendant in descendants[1:]:
+            children[descendant.parent_id].append(descendant)
+        root = descendants[0]
+        root.wiki_path = page.path
+        tree.extend(build_subtree(root, children))
+    return tree
+
+
+def build_subtree(page, children):
+    subtree = [page]
+    if children[page.id]:
+        children_tree = []
+        for child in children[page.id]:
+            child.wiki_path = page.wiki_path + child.slug + '/'
+            children_tree.extend(build_subtree(child, children))
+        subtree.append(children_tree)
+    return subtree
 
 
 def render_html_tree(tree, html):
@@ -66,16 +103,58 @@ def render_html_tree(tree, html):
             elif not all([item.article.group_write, item.article.other_write]):
                 state = 'closed'
 
+            if hasattr(item, 'wiki_path'):
+                link = reverse('wiki:get', kwargs={'path': item.wiki_path})
+            else:
+                link = item.get_absolute_url()
+            revisions = getattr(item, 'revision_count', None)
+            if revisions is None:
+                revisions = item.article.articlerevision_set.count()
+
             html += TEMPLATE.format(
                     title=item.article.current_revision.title,
-                    link=item.get_absolute_url(),
-                    revisions=item.article.articlerevision_set.count(),
+                    link=link,
+                    revisions=revisions,
                     date=item.article.current_revision.created.strftime(_('%m/%d/%y %H:%M')),
                     state=state)
 
     return tree, html
 
 
+def get_html_tree(base_page):
+    """Returns the HTML tree of a wiki page and its descendants.
+       The HTML is cached until a page of the tree is created, revised or
+       deleted, or until the tree permissions change (see `set_permissions`).
+        Args:    base_page (URLPath)
+        Returns: string
+    """
+    version = get_tree_version(base_page)
+    cache_key = get_html_tree_cache_key(base_page, get_language())
+    cached = cache.get(cache_key)
+    if cached is not None and cached['version'] == version:
+        return cached['html']
+    _tree, html = render_html_tree(get_page_tree([base_page]), '')
+    cache.set(cache_key, {'version': version, 'html': html}, HTML_TREE_CACHE_TIMEOUT)
+    return html
+
+
+def get_tree_version(base_page):
+    """Returns a value that changes whenever a page of the tree is created,
+       revised or deleted.
+    """
+    import wiki.models
+
+    return wiki.models.ArticleRevision.objects.filter(
+        article__urlpath__tree_id=base_page.tree_id,
+        article__urlpath__lft__gte=base_page.lft,
+        article__urlpath__rght__lte=base_page.rght,
+    ).aggregate(last_revision_id=Max('id'), revision_count=Count('id'))
+
+
+def get_html_tree_cache_key(base_page, language):
+    return u'funwiki-html-tree-{}-{}'.format(base_page.id, language)
+
+
 def set_permissions(course, value):
     """Set wiki articles write permissions to True of False.
         Args:    course (Mongo object)
@@ -92,4 +171,7 @@ def set_permissions(course, value):
         base_page_descendants = base_page.article.descendant_objects()  # will recursively return all URLPath children to this article (whatever the depth)
         wiki.models.article.Article.objects.filter(
                     urlpath__in=base_page_descendants).update(group_write=value, other_write=value)
+        cache.delete_many([
+            get_html_tree_cache_key(base_page, language) for language, _name in settings.LANGUAGES
+        ])
     return base_page
\ No newline at end of file
@@ -49,3 +49,25 @@ class TestWikiUtils(ModuleStoreTestCase):
         tree = funwiki.get_page_tree([base_page])
         tree, html = funwiki.render_html_tree(tree, '')
         self.assertEqual(2, len(BeautifulSoup(html).find('ul').find('ul').find('ul').find_all('li')))  # page111 and page112
+
+    def test_render_html_tree_links(self):
+        from fun.utils import funwiki
+        base_page = funwiki.get_base_page(self.course)
+        tree, html = funwiki.render_html_tree(funwiki.get_page_tree([base_page]), '')
+        links = [a['href'] for a in BeautifulSoup(html).find_all('a')]
+        self.assertIn(self.page111.get_absolute_url(), links)
+        self.assertEqual(6, len(links))
+
+    def test_html_tree_is_cached_until_the_wiki_is_modified(self):
+        from django.core.cache import cache
+        from wiki.models.urlpath import URLPath
+        from fun.utils import funwiki
+        cache.clear()
+        base_page = funwiki.get_base_page(self.course)
+        html = funwiki.get_html_tree(base_page)
+        with self.assertNumQueries(1):
+            self.assertEqual(html, funwiki.get_html_tree(base_page))
+
+        URLPath.create_article(self.page2, 'page21', title=u"page 2.1")
+        base_page = funwiki.get_base_page(self.course)
+        self.assertIn(u"page 2.1", funwiki.get_html_tree(base_page))
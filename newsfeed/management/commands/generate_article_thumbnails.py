@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from django.core.management.base import BaseCommand
+
+from newsfeed.models import Article
+from newsfeed.tasks import generate_article_thumbnails
+
+
+class Command(BaseCommand):
+
+    help = """Queue the generation of the thumbnails of all articles that have
+an image. This should be run once for articles created before thumbnails were
+generated in the background.
+"""
+
+    def handle(self, *args, **options):
+        articles = Article.objects.exclude(thumbnail='').exclude(thumbnail__isnull=True)
+        count = 0
+        for article_id, thumbnail_name in articles.values_list('id', 'thumbnail'):
+            generate_article_thumbnails.delay(article_id, thumbnail_name)
+            count += 1
+        self.stdout.write("Queued thumbnail generation for {} articles\n".format(count))
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsfeed', '0002_auto_20161011_1724'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='thumbnails_info',
+            field=jsonfield.fields.JSONField(verbose_name='thumbnails info', null=True, editable=False, blank=True),
+        ),
+    ]
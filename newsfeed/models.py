@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+from time import time
+
 import ckeditor.fields
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.core.validators import validate_slug
 from django.db import models
@@ -12,6 +15,18 @@ from django.utils.translation import get_language
 
 from easy_thumbnails.exceptions import InvalidImageFormatError
 from easy_thumbnails.files import get_thumbnailer
+from jsonfield.fields import JSONField
+
+
+# The thumbnail sizes were defined to have the same ratio in
+# all formats: width/height = 1.648
+THUMBNAIL_SIZES = {
+    'very-big': (1030, 625),
+    'big': (570, 346),
+    'primary': (570, 346),
+    'secondary': (275, 167),
+    'facebook': (600, 364)
+}
 
 
 class ArticleManager(models.Manager):
@@ -102,14 +117,32 @@ class Article(models.Model):
             auto_now=True)
     published = models.BooleanField(verbose_name=_("published"),
             default=False)
+    thumbnails_info = JSONField(_('thumbnails info'), blank=True, null=True, editable=False)
 
     microsite = models.CharField(max_length=128, blank=True, db_index=True)
 
     objects = ArticleManager()
 
+    # News listings are cached with this version, which changes whenever an
+    # article is modified (see newsfeed.signals)
+    NEWSFEED_VERSION_CACHE_KEY = 'newsfeed-version'
+
     class Meta:
         ordering = ["-created_at"]
 
+    @classmethod
+    def get_newsfeed_version(cls):
+        version = cache.get(cls.NEWSFEED_VERSION_CACHE_KEY)
+        if version is None:
+            version = cls.update_newsfeed_version()
+        return version
+
+    @classmethod
+    def update_newsfeed_version(cls):
+        version = time()
+        cache.set(cls.NEWSFEED_VERSION_CACHE_KEY, version, None)
+        return version
+
     def related(self):
         """
         Return article that share the same category.
@@ -125,21 +158,40 @@ class Article(models.Model):
         return self.lead_paragraph if self.lead_paragraph else ''
 
     def get_thumbnail(self, size):
-        try:
-            thumbnailer = get_thumbnailer(self.thumbnail)
-            # The thumbnail sizes were defined to have the same ratio in
-            # all formats: width/height = 1.648
-            sizes = {
-                'very-big': (1030, 625),
-                'big': (570, 346),
-                'primary': (570, 346),
-                'secondary': (275, 167),
-                'facebook': (600, 364)
-            }
-            thumbnail_options = {'crop': 'smart', 'size': sizes[size], 'upscale': True}
-            return thumbnailer.get_thumbnail(thumbnail_options)
-        except InvalidImageFormatError:
-            return ''  ## todo: generic image
+        """
+        Return the name of the thumbnail in the given size. Thumbnails are
+        generated in the background when the article image changes (see
+        newsfeed.tasks), so that no image is processed when rendering pages.
+        """
+        if not self.thumbnail:
+            return ''
+        thumbnails_info = self.thumbnails_info or {}
+        if thumbnails_info.get('source') == self.thumbnail.name:
+            return thumbnails_info.get(size, '')
+        # Thumbnails have not been generated yet
+        thumbnail = get_thumbnailer(self.thumbnail).get_existing_thumbnail(thumbnail_options(size))
+        return thumbnail.name if thumbnail else ''  ## todo: generic image
+
+    def generate_thumbnails(self):
+        """
+        Generate the thumbnails of the article image in all sizes.
+
+        Returns:
+            {size: thumbnail name} dict, with the name of the source image
+            under the 'source' key.
+        """
+        thumbnailer = get_thumbnailer(self.thumbnail)
+        thumbnails_info = {'source': self.thumbnail.name}
+        for size in THUMBNAIL_SIZES:
+            try:
+                thumbnails_info[size] = thumbnailer.get_thumbnail(thumbnail_options(size)).name
+            except InvalidImageFormatError:
+                thumbnails_info[size] = ''
+        return thumbnails_info
 
     def get_absolute_url(self):
         return reverse('newsfeed-article', args=[self.slug])
+
+
+def thumbnail_options(size):
+    return {'crop': 'smart', 'size': THUMBNAIL_SIZES[size], 'upscale': True}
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Article, ArticleCategory
+from .tasks import generate_article_thumbnails
+
+
+@receiver(post_save, sender=Article, dispatch_uid='fun.newsfeed.signals.article_thumbnails')
+def generate_thumbnails(sender, instance, **kwargs):
+    if not instance.thumbnail:
+        return
+    if (instance.thumbnails_info or {}).get('source') != instance.thumbnail.name:
+        generate_article_thumbnails.delay(instance.pk, instance.thumbnail.name)
+
+
+@receiver(post_save, sender=Article, dispatch_uid='fun.newsfeed.signals.article_save')
+@receiver(post_delete, sender=Article, dispatch_uid='fun.newsfeed.signals.article_delete')
+@receiver(post_save, sender=ArticleCategory, dispatch_uid='fun.newsfeed.signals.category_save')
+@receiver(post_delete, sender=ArticleCategory, dispatch_uid='fun.newsfeed.signals.category_delete')
+def update_newsfeed_version(sender, **kwargs):
+    Article.update_newsfeed_version()
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from celery import shared_task
+
+from .models import Article
+
+
+@shared_task
+def generate_article_thumbnails(article_id, thumbnail_name):
+    '''
+    Generate the thumbnails of an article image in all sizes and save their
+    names on the article. The image name is passed along with the article id
+    because the task may run before the article is committed. Thumbnails are
+    not saved if the article image was changed in the meantime.
+    '''
+    article = Article(pk=article_id, thumbnail=thumbnail_name)
+    thumbnails_info = article.generate_thumbnails()
+    updated = Article.objects.filter(
+        pk=article_id, thumbnail=thumbnail_name
+    ).update(thumbnails_info=thumbnails_info)
+    if updated:
+        Article.update_newsfeed_version()
@@ -2,6 +2,7 @@
 
 import datetime
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
@@ -14,6 +15,7 @@ from .factories import ArticleCategoryFactory, ArticleFactory
 @skipUnlessLms
 class TestNewsFeed(TestCase, RSSDeclarationMixin):
     def setUp(self):
+        cache.clear()
         self.url = reverse('newsfeed-rss')
         category = ArticleCategoryFactory()
         date = datetime.datetime(2015, 1, 1)
@@ -29,3 +31,9 @@ class TestNewsFeed(TestCase, RSSDeclarationMixin):
         item3 = dict(feed['channel']['item'][1])
         self.assertEqual('Title 2', item2['title'])
         self.assertEqual('Title 3', item3['title'])
+
+    def test_feed_is_refreshed_when_an_article_is_published(self):
+        self.assertEqual(2, len(self.get_parsed_feed()['channel']['item']))
+        self.item1.published = True
+        self.item1.save()
+        self.assertEqual(3, len(self.get_parsed_feed()['channel']['item']))
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
+import mock
+
 from django.db import IntegrityError
 from django.test import TestCase
 import django.utils.translation
 
 from fun.tests.utils import skipUnlessLms
 from newsfeed import models
+from newsfeed.tasks import generate_article_thumbnails
 
 from .factories import ArticleFactory
 
@@ -75,3 +78,26 @@ class ArticleTest(TestCase):
         self.assertEqual(2, len(articles))
         self.assertEqual(article2.pk, articles[0].pk)
         self.assertEqual(article1.pk, articles[1].pk)
+
+    def test_get_thumbnail_without_image(self):
+        article = ArticleFactory.create()
+        self.assertEqual('', article.get_thumbnail('big'))
+
+    def test_get_generated_thumbnail(self):
+        article = ArticleFactory.build(thumbnail='newsfeed/image.png', thumbnails_info={
+            'source': 'newsfeed/image.png',
+            'big': 'newsfeed/image.png.570x346_q85_crop-smart_upscale.png',
+        })
+        self.assertEqual('newsfeed/image.png.570x346_q85_crop-smart_upscale.png', article.get_thumbnail('big'))
+
+    @mock.patch('newsfeed.models.Article.generate_thumbnails')
+    def test_thumbnails_of_a_replaced_image_are_not_saved(self, mock_generate_thumbnails):
+        mock_generate_thumbnails.return_value = {'source': 'newsfeed/old.png', 'big': 'newsfeed/old-big.png'}
+        article = ArticleFactory.create(
+            thumbnail='newsfeed/new.png', thumbnails_info={'source': 'newsfeed/new.png'}
+        )
+
+        generate_article_thumbnails(article.pk, 'newsfeed/old.png')
+
+        article = models.Article.objects.get(pk=article.pk)
+        self.assertEqual({'source': 'newsfeed/new.png'}, article.thumbnails_info)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
 
 from django.core.urlresolvers import reverse
@@ -16,6 +17,7 @@ class ViewArticlesTest(TestCase):
     def setUp(self):
         from .. import views
         self.views = views
+        cache.clear()
 
     def create_user_and_login(self, as_staff=False):
         user = UserFactory(is_staff=as_staff)
@@ -165,6 +167,28 @@ class ViewArticlesTest(TestCase):
         with self.assertNumQueries(1):
             self.views.paginate(qs, 2, 10)
 
+    def test_cached_page(self):
+        for _ in range(3):
+            factories.ArticleFactory.create(published=True)
+        articles, featured = self.views.get_cached_page(1, 10)
+        with self.assertNumQueries(0):
+            cached_articles, cached_featured = self.views.get_cached_page(1, 10)
+        self.assertEqual(featured, cached_featured)
+        self.assertEqual(list(articles.object_list), list(cached_articles.object_list))
+        self.assertEqual(1, cached_articles.number)
+        self.assertEqual(2, cached_articles.paginator.count)
+
+    def test_cached_page_is_refreshed_when_an_article_is_published(self):
+        factories.ArticleFactory.create(published=True)
+        article = factories.ArticleFactory.create(published=False)
+        articles, featured = self.views.get_cached_page(1, 10)
+        self.assertNotEqual(article, featured)
+
+        article.published = True
+        article.save()
+        articles, featured = self.views.get_cached_page(1, 10)
+        self.assertEqual(article, featured)
+
     def test_admin_upload_url(self):
         upload_url = reverse('news-ckeditor-upload')
         browse_url = reverse('news-ckeditor-browse')
@@ -2,10 +2,11 @@
 
 from django.conf import settings
 from django.contrib.syndication.views import Feed
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils.feedgenerator import Rss201rev2Feed
-from django.utils.translation import ugettext_lazy as _
+from django.utils.translation import get_language, ugettext_lazy as _
 
 from edxmako.shortcuts import render_to_response
 
@@ -20,6 +21,10 @@ from . import models
 
 ARTICLES_PER_PAGE = 10
 
+# Listings are also invalidated when an article is modified, since their
+# cache keys contain the newsfeed version
+NEWSFEED_CACHE_TIMEOUT = 24*60*60
+
 def get_articles():
     """
     List viewable articles for the current site.
@@ -63,9 +68,52 @@ def top_news(count=5):
     articles = get_articles()[:count]
     return [articles[idx] if len(articles) > idx else None for idx in range(count)]
 
+def get_cached_page(page_nb, article_per_page):
+    """
+    Same as paginate(get_articles(), ...), but the page articles are cached
+    per site, language and page until an article is modified.
+    """
+    cache_key = u"newsfeed-page-{}-{}-{}-{}-{}".format(
+        get_site_name(), get_language(), models.Article.get_newsfeed_version(),
+        page_nb, article_per_page
+    )
+    cached = cache.get(cache_key)
+    if cached is None:
+        articles, featured = paginate(
+            get_articles().select_related('category'), page_nb, article_per_page
+        )
+        cached = {
+            'articles': list(articles.object_list),
+            'count': articles.paginator.count,
+            'number': articles.number,
+            'featured': featured,
+        }
+        cache.set(cache_key, cached, NEWSFEED_CACHE_TIMEOUT)
+    paginator = Paginator(CachedPageArticles(cached['articles'], cached['count']), article_per_page)
+    return paginator.page(cached['number']), cached['featured']
+
+class CachedPageArticles(object):
+    """
+    Stand-in for the full list of articles when paginating a cached page: it
+    only knows the total number of articles and the articles of the page.
+    """
+    def __init__(self, page_articles, count):
+        self.page_articles = page_articles
+        # Not named 'count', which would shadow the count() method that the
+        # paginator looks for
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, page_slice):
+        return self.page_articles
+
 def article_list(request):
     # We exclude the article that's selected in the featured section.
-    return render_articles(get_articles(), request.GET)
+    page, nb_items = parse_request(request.GET)
+    articles, featured = get_cached_page(page, nb_items)
+    return render_page(articles, featured, page, nb_items)
 
 @staff_required
 def article_list_preview(request, slug):
@@ -82,7 +130,9 @@ def parse_request(get_dict):
 def render_articles(articles_queryset, get_dict):
     page, nb_items = parse_request(get_dict)
     articles, featured = paginate(articles_queryset, page, nb_items)
+    return render_page(articles, featured, page, nb_items)
 
+def render_page(articles, featured, page, nb_items):
     start = 1 + (page-1)*nb_items + (0 if articles.number==1 else 1)
     end = len(articles.object_list) + start - (1 if articles.number!=1 else 0)
 
@@ -97,6 +147,11 @@ def filter_queryset_for_site(queryset):
         queryset = queryset.filter(microsite=microsite.get_value('SITE_NAME'))
     return queryset
 
+def get_site_name():
+    if settings.FEATURES['USE_MICROSITES']:
+        return microsite.get_value('SITE_NAME')
+    return settings.SITE_NAME
+
 
 def article_detail(request, slug):
     return render_article(models.Article.objects.published(), slug)
@@ -141,6 +196,17 @@ class NewsFeed(Feed):
     feed_type = Rss201rev2Feed
     __name__ = 'FUNNEWSRSS'
 
+    def __call__(self, request, *args, **kwargs):
+        """The feed is cached per site and language until an article is modified."""
+        cache_key = u"newsfeed-rss-{}-{}-{}".format(
+            get_site_name(), get_language(), models.Article.get_newsfeed_version()
+        )
+        response = cache.get(cache_key)
+        if response is None:
+            response = super(NewsFeed, self).__call__(request, *args, **kwargs)
+            cache.set(cache_key, response, NEWSFEED_CACHE_TIMEOUT)
+        return response
+
     def get_site(self):
         protocol = 'https://'
         site = settings.SITE_NAME
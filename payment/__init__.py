@@ -0,0 +1,2 @@
+# Signal receivers are registered when the app is ready: see apps.py
+default_app_config = 'payment.apps.PaymentConfig'
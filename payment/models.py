@@ -2,6 +2,7 @@
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils.translation import get_language, ugettext_lazy as _
 from django.conf import settings
 from docutils.core import publish_string
@@ -43,6 +44,45 @@ TERMS_TEMPLATE = """
 
 """
 
+## Rendering ReST is slow: terms are rendered when their translations are
+## saved (see payment.signals) and the resulting HTML is cached
+TERMS_HTML_CACHE_TIMEOUT = 7*24*60*60
+
+def terms_html_cache_key(terms_id, language):
+    return u"payment-terms-html-{}-{}".format(terms_id, language)
+
+def clear_terms_html_cache(terms_id):
+    languages = set(dict(settings.LANGUAGES)) | set([DEFAULT_LANGUAGE])
+    cache.delete_many([terms_html_cache_key(terms_id, language) for language in languages])
+
+def render_terms_html(text, language):
+    """Render ReST terms to an HTML fragment"""
+    ## walking around ReST generating a 4.1 full html doc
+    ## Accessibility
+    res = S(
+                "body",
+                publish_string(
+                    text,
+                    writer_name='html'
+                ),
+                parser='html',
+    )
+    res.remove_namespaces()
+    res(".document").attr["lang"] = language
+    return res.html()
+
+def get_translated_term(translations, language):
+    """Return the translation of the terms in the given language, falling back
+    to the default language if it is missing or empty.
+
+    Args:
+        translations (dict): {language: TranslatedTerms}
+    """
+    translated_term = translations.get(language)
+    if translated_term is None or not len(translated_term.tr_text):
+        translated_term = translations.get(DEFAULT_LANGUAGE)
+    return translated_term
+
 class TermsAndConditions(models.Model):
     name = models.CharField(
         max_length=100, verbose_name=_(u"Name"),
@@ -66,33 +106,50 @@ class TermsAndConditions(models.Model):
         present to the user. (order = user settings, cookies ...)
         Defaults to the one of reference for the country of reference if None
         available
+        Rendered translations are cached (see cache_html). On a cache miss,
+        only the requested language is rendered.
         """
         language = get_language()
-        good_one = language in settings.LANGUAGES \
-            and language \
-            or DEFAULT_LANGUAGE
-        just_in_case=""
-        to_return = None,None
-        for translated_term in self.texts.all():
-            if translated_term.language == language and len(translated_term.tr_text):
-                to_return = unicode(translated_term.tr_text), translated_term.language
-            if translated_term.language == DEFAULT_LANGUAGE:
-              just_in_case = unicode(translated_term.tr_text),DEFAULT_LANGUAGE
-        ## walking around ReST generating a 4.1 full html doc
-        ## Accessibility
-        text, lang = to_return if to_return[0] else just_in_case
-        res = S(
-                    "body",
-                    publish_string(
-                        text,
-                        writer_name='html'
-                    ),
-                    parser='html',
+        if language not in dict(settings.LANGUAGES):
+            language = DEFAULT_LANGUAGE
+        cache_key = terms_html_cache_key(self.pk, language)
+        html = cache.get(cache_key)
+        if html is None:
+            translations = {
+                t.language: t for t in self.texts.filter(language__in=[language, DEFAULT_LANGUAGE])
+            }
+            translated_term = get_translated_term(translations, language)
+            html = u""
+            if translated_term is not None:
+                html = render_terms_html(unicode(translated_term.tr_text), translated_term.language)
+            cache.set(cache_key, html, TERMS_HTML_CACHE_TIMEOUT)
+        return html
+
+    def cache_html(self):
+        """
+        Render the terms in every supported language and cache the result.
+        Each translation is rendered only once, even when it is used as a
+        fallback for several languages.
+        Returns: {language: html} dict
+        """
+        translations = {t.language: t for t in self.texts.all()}
+        rendered = {}
+        html_by_language = {}
+        for language in set(dict(settings.LANGUAGES)) | set([DEFAULT_LANGUAGE]):
+            translated_term = get_translated_term(translations, language)
+            if translated_term is None:
+                html_by_language[language] = u""
+                continue
+            if translated_term.language not in rendered:
+                rendered[translated_term.language] = render_terms_html(
+                    unicode(translated_term.tr_text), translated_term.language
+                )
+            html_by_language[language] = rendered[translated_term.language]
+        cache.set_many(
+            {terms_html_cache_key(self.pk, language): html for language, html in html_by_language.iteritems()},
+            TERMS_HTML_CACHE_TIMEOUT
         )
-        res.remove_namespaces()
-        doc = res.find(".document")[0]
-        res(".document").attr["lang"] = lang
-        return res.html()
+        return html_by_language
 
     tr_text = text = property(tr_text)
 
@@ -158,21 +215,35 @@ class UserAcceptance(models.Model):
         verbose_name = _(u"User terms and conditions acceptance")
         unique_together = ['user', 'terms']
 
+## The id of the latest terms is cached until terms are saved or deleted
+## (see payment.signals)
+LATEST_TERMS_CACHE_KEY = 'payment-latest-terms-id'
+LATEST_TERMS_CACHE_TIMEOUT = 60*60
+
+def get_latest_terms_id():
+    """Return the id of the latest payment terms, or None if there are no
+    terms yet."""
+    terms_id = cache.get(LATEST_TERMS_CACHE_KEY)
+    if terms_id is None:
+        latest = TermsAndConditions.get_latest()
+        # 0 stands for "no terms", since None means the key is not cached
+        terms_id = latest.pk if latest else 0
+        cache.set(LATEST_TERMS_CACHE_KEY, terms_id, LATEST_TERMS_CACHE_TIMEOUT)
+    return terms_id or None
+
+def clear_latest_terms_cache():
+    cache.delete(LATEST_TERMS_CACHE_KEY)
+
 def legal_acceptance(user):
     COMPLIANT, NOT_COMPLIANT = True, False
     if user.is_anonymous():
         return COMPLIANT
-    latest = TermsAndConditions.get_latest()
-    if latest is None or latest == TERMS_TEMPLATE:
+    latest_id = get_latest_terms_id()
+    if latest_id is None:
         return COMPLIANT
-    try:
-        latest_acceptation = UserAcceptance.objects.get(
-            terms=latest,
-            user=user,
-        )
-    except UserAcceptance.DoesNotExist:
-        return NOT_COMPLIANT
-    return COMPLIANT
+    if UserAcceptance.objects.filter(terms_id=latest_id, user=user).exists():
+        return COMPLIANT
+    return NOT_COMPLIANT
 
 class TranslatedTerms(models.Model):
     """Terms and conditions might have to be made available to
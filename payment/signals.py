@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import TermsAndConditions, TranslatedTerms, clear_latest_terms_cache, clear_terms_html_cache
+
+
+@receiver(post_save, sender=TermsAndConditions, dispatch_uid='fun.payment.signals.terms_save')
+@receiver(post_delete, sender=TermsAndConditions, dispatch_uid='fun.payment.signals.terms_delete')
+def clear_latest_terms(sender, instance, **kwargs):
+    clear_latest_terms_cache()
+
+
+@receiver(post_save, sender=TranslatedTerms, dispatch_uid='fun.payment.signals.translated_terms_save')
+def render_terms(sender, instance, **kwargs):
+    instance.term.cache_html()
+
+
+@receiver(post_delete, sender=TranslatedTerms, dispatch_uid='fun.payment.signals.translated_terms_delete')
+def clear_terms_html(sender, instance, **kwargs):
+    clear_terms_html_cache(instance.term_id)
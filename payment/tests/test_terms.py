@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
+import mock
+import re
 
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.client import RequestFactory
+from django.utils import translation
 
 from student.tests.factories import UserFactory
 
+from fun.middleware.enforce_legal_acceptance import LegalAcceptance
 from fun.tests.utils import skipUnlessLms
 
-from ..models import TermsAndConditions, UserAcceptance
+from ..models import TermsAndConditions, TranslatedTerms, UserAcceptance, PAYMENT_TERMS, legal_acceptance
 
 
 @skipUnlessLms
@@ -63,3 +69,96 @@ class TermsAndConditionTest(TestCase):
         terms = TermsAndConditions.user_has_to_accept_new_version(
                 name='test3', user=self.user)
         self.assertEqual(False, terms)
+
+
+@skipUnlessLms
+class LegalAcceptanceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.terms = TermsAndConditions.objects.create(name=PAYMENT_TERMS, version='1.0',
+                text=u"https://xkcd.com/501/")
+        self.middleware = LegalAcceptance()
+
+    def get_request(self, path='/dashboard'):
+        request = RequestFactory().get(path)
+        request.user = self.user
+        request.session = {}
+        return request
+
+    def process_view(self, request):
+        view = lambda request: "view"
+        return self.middleware.process_view(request, view, [], {})
+
+    def test_latest_terms_are_cached(self):
+        self.assertFalse(legal_acceptance(self.user))
+        with self.assertNumQueries(1):
+            self.assertFalse(legal_acceptance(self.user))
+
+    def test_latest_terms_cache_is_cleared_when_terms_are_published(self):
+        self.terms.accept(self.user)
+        self.assertTrue(legal_acceptance(self.user))
+        TermsAndConditions.objects.create(name=PAYMENT_TERMS, version='1.1',
+                text=u"https://xkcd.com/501/")
+        self.assertFalse(legal_acceptance(self.user))
+
+    def test_user_who_did_not_accept_terms_is_redirected(self):
+        response = self.process_view(self.get_request())
+        self.assertEqual(302, response.status_code)
+
+    def test_accepted_terms_are_saved_in_session(self):
+        self.terms.accept(self.user)
+        request = self.get_request()
+        self.assertIsNone(self.process_view(request))
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.process_view(request))
+
+    def test_whitelisted_urls_are_not_checked(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.process_view(self.get_request('/payment/terms/')))
+            self.assertIsNone(self.process_view(self.get_request('/static/image.png')))
+
+    def test_whitelist_pattern_flags_are_kept(self):
+        with self.settings(AGREEMENT_WHITELIST=[r"^/payment/", re.compile(r"^/about/", re.IGNORECASE)]):
+            middleware = LegalAcceptance()
+        self.assertTrue(middleware.is_whitelisted('/ABOUT/'))
+        self.assertTrue(middleware.is_whitelisted('/payment/'))
+        self.assertFalse(middleware.is_whitelisted('/PAYMENT/'))
+
+
+@skipUnlessLms
+class TranslatedTermsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.terms = TermsAndConditions.objects.create(name=PAYMENT_TERMS, version='1.0',
+                text=u"https://xkcd.com/501/")
+        self.terms.texts.create(language='fr', tr_text=u"Conditions générales")
+
+    def test_translation_is_rendered_in_html(self):
+        with translation.override('fr'):
+            self.assertIn(u"Conditions générales", self.terms.text)
+            self.assertIn(u'lang="fr"', self.terms.text)
+
+    def test_default_language_is_used_when_translation_is_missing(self):
+        with translation.override('en'):
+            self.assertIn(u"Conditions générales", self.terms.text)
+
+    def test_rendered_html_is_cached(self):
+        with translation.override('fr'):
+            with self.assertNumQueries(0):
+                self.assertIn(u"Conditions générales", self.terms.text)
+
+    def test_only_requested_language_is_rendered_on_cache_miss(self):
+        cache.clear()
+        with mock.patch('payment.models.render_terms_html', return_value=u"html") as mock_render:
+            with translation.override('en'):
+                self.assertEqual(u"html", self.terms.text)
+        mock_render.assert_called_once_with(u"Conditions générales", 'fr')
+
+    def test_cache_is_refreshed_when_translation_is_saved(self):
+        self.terms.texts.create(language='en', tr_text=u"Terms and conditions")
+        with translation.override('en'):
+            self.assertIn(u"Terms and conditions", self.terms.text)
+        TranslatedTerms.objects.get(language='en').delete()
+        with translation.override('en'):
+            self.assertIn(u"Conditions générales", self.terms.text)
@@ -36,6 +36,9 @@ class BaseClient(object):
     STATUS_READY = 'ready'
     STATUS_ERROR = 'error'
 
+    # Default number of videos returned by get_videos_page
+    VIDEOS_PAGE_SIZE = 50
+
     def __init__(self, course_key_string):
         self.course_id = CourseKey.from_string(course_key_string)
         self.course_module = get_course(course_key_string)
@@ -61,6 +64,25 @@ class BaseClient(object):
         """Return a list of videos for the course."""
         return list(self.iter_videos())
 
+    def iter_videos(self, page_token=None, page_size=None):
+        """Iterator on the videos for this course.
+
+        Videos are fetched lazily, one page at a time, through
+        get_videos_page. See get_videos_page for the format of the yielded
+        objects.
+
+        Args:
+            page_token (str): if defined, start iterating from this page.
+            page_size (int): number of videos fetched per page.
+        """
+        while True:
+            page = self.get_videos_page(page_token=page_token, page_size=page_size)
+            for video in page['videos']:
+                yield video
+            page_token = page['next_page_token']
+            if page_token is None:
+                break
+
     def get_subtitles(self, video_id):
         subtitles = []
         for subtitle in self.iter_subtitles(video_id):
@@ -106,30 +128,41 @@ class BaseClient(object):
         """
         raise NotImplementedError()
 
-    def iter_videos(self):
-        """Iterator on the videos for this course.
+    def get_videos_page(self, page_token=None, page_size=None):
+        """Return a single page of videos for this course.
 
-        Returns:
-            videos (iterator): the objects yielded by this operator are dict of the form:
+        Args:
+            page_token (str): opaque token returned by a previous call to this
+            method. If None, the first page is returned.
+            page_size (int): maximum number of videos in the page. Defaults to
+            VIDEOS_PAGE_SIZE.
+
+        Returns: {
+            'videos': [...], # list of videos, see below
+            'count': ..., # total number of videos in the course
+            'next_page_token': ..., # token of the next page, None for the last page
+        }
+
+        Each video is a dict of the form:
+        {
+            'id': ...,
+            'created_at': ...,
+            'created_at_timestamp': ...,
+            'title':  ...,
+            'thumbnail_url': ...,
+            'status': ...,
+            'encoding_progress': ...,
+            'embed_url': ...,
+            'video_sources': [...
                 {
-                    'id': ...,
-                    'created_at': ...,
-                    'created_at_timestamp': ...,
-                    'title':  ...,
-                    'thumbnail_url': ...,
-                    'status': ...,
-                    'encoding_progress': ...,
-                    'embed_url': ...,
-                    'video_sources': [...
-                        {
-                            'label': ...,
-                            'res': ...,
-                            'url': ...
-                        },
-                        ...
-                    ],
-                    'external_link': ...,
-                }
+                    'label': ...,
+                    'res': ...,
+                    'url': ...
+                },
+                ...
+            ],
+            'external_link': ...,
+        }
         """
         raise NotImplementedError()
 
@@ -211,3 +244,12 @@ class BaseClient(object):
             None
         """
         raise NotImplementedError()
+
+    def download_subtitle(self, subtitle_id):
+        """Download the content of a subtitle file. This is required only for
+        subtitles that are not served through absolute urls.
+
+        Returns:
+            content (str)
+        """
+        raise NotImplementedError()
@@ -97,6 +97,14 @@ class Client(BaseClient):
         response = self.get('videos/{}'.format(video_id))
         return response.json()
 
+    def fetch_videos(self):
+        """Return the raw, unconverted list of playlist videos."""
+        return self.get(
+            'videos/',
+            params={"playlist_id": self.playlist_id},
+            log_error=True,
+        ).json()
+
     def get(self, endpoint, log_error=False, **kwargs):
         return self.request(endpoint, 'GET', log_error=log_error, **kwargs)
 
@@ -212,14 +220,24 @@ class Client(BaseClient):
         video = self.fetch_video(video_id)
         return self.convert_video_to_dict(video)
 
-    def iter_videos(self):
-        for video in self.get(
-                'videos/',
-                params={"playlist_id": self.playlist_id},
-                log_error=True,
-        ).json():
+    def iter_videos(self, page_token=None, page_size=None):
+        # The whole playlist is returned by a single API call, so there is no
+        # need to fetch it page by page: we just convert videos lazily.
+        for video in self.fetch_videos()[page_token_to_offset(page_token):]:
             yield self.convert_video_to_dict(video)
 
+    def get_videos_page(self, page_token=None, page_size=None):
+        # Page tokens are simply offsets in the video list. Only the videos
+        # from the requested page are converted.
+        videos = self.fetch_videos()
+        start = page_token_to_offset(page_token)
+        end = start + (page_size or self.VIDEOS_PAGE_SIZE)
+        return {
+            'videos': [self.convert_video_to_dict(video) for video in videos[start:end]],
+            'count': len(videos),
+            'next_page_token': str(end) if end < len(videos) else None,
+        }
+
     def delete_video(self, video_id):
         self.delete('videos/{}'.format(video_id))
 
@@ -290,3 +308,15 @@ class Client(BaseClient):
 
 class VideofrontError(Exception):
     pass
+
+
+def page_token_to_offset(page_token):
+    if page_token is None:
+        return 0
+    try:
+        offset = int(page_token)
+    except ValueError:
+        raise ClientError("Invalid page token: {}".format(page_token))
+    if offset < 0:
+        raise ClientError("Invalid page token: {}".format(page_token))
+    return offset
@@ -1,5 +1,10 @@
+import glob
+import logging
 import mimetypes
+import os
+import tempfile
 import time
+import uuid
 import httplib2
 
 import googleapiclient.discovery
@@ -7,6 +12,7 @@ from googleapiclient.http import MediaIoBaseUpload
 import oauth2client.client
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils.dateparse import parse_datetime
 from django.utils.translation import ugettext as _
@@ -16,6 +22,18 @@ from ..models import YoutubeAuth, YoutubeCourseSettings
 from .base import BaseClient, ClientError, MissingVideo, MissingCredentials
 
 
+logger = logging.getLogger(__name__)
+
+# Number of quota units consumed by each type of Youtube API request, as per
+# https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COST_LIST = 1
+QUOTA_COST_WRITE = 50
+QUOTA_COST_VIDEO_UPLOAD = 1600
+QUOTA_COST_CAPTION_LIST = 50
+QUOTA_COST_CAPTION_UPLOAD = 400
+QUOTA_COST_CAPTION_DOWNLOAD = 200
+
+
 class Client(BaseClient):
     """
     This is the client for the Youtube video provider. Each university has its
@@ -40,11 +58,24 @@ class Client(BaseClient):
 
     FILE_PARAMETER_NAME = "path"
 
+    # Maximum number of video ids that can be passed to a single videos().list
+    # call
+    VIDEOS_LIST_MAX_IDS = 50
+
+    # Videos are uploaded to Youtube by chunks of this size
+    UPLOAD_CHUNK_SIZE = 1024*1024*5 # 5 Mb
+    # Number of times failed upload requests are retried, with exponential
+    # backoff
+    UPLOAD_NUM_RETRIES = 5
+
     def __init__(self, course_key_string):
         super(Client, self).__init__(course_key_string)
         self.course_key_string = course_key_string
         self._credentials = None
         self._playlist_id = None
+        self.video_cache = VideoCache(course_key_string)
+        # Number of Youtube API quota units consumed by this client
+        self.quota_usage = 0
 
     @property
     def auth(self):
@@ -118,7 +149,8 @@ class Client(BaseClient):
         for playlist in iter_page_items(
                 self.auth.playlists().list,
                 part="id,snippet", mine=True,
-                maxResults=50
+                maxResults=50,
+                execute=self.execute
         ):
             if playlist["snippet"]["title"] == title:
                 return playlist["id"]
@@ -131,13 +163,16 @@ class Client(BaseClient):
         Return:
             playlist_id (str)
         """
-        playlist = self.auth.playlists().insert(
-            part="snippet,status",
-            body={
-                "snippet": {"title": title},
-                "status": {"privacyStatus": "unlisted"}
-            }
-        ).execute()
+        playlist = self.execute(
+            self.auth.playlists().insert(
+                part="snippet,status",
+                body={
+                    "snippet": {"title": title},
+                    "status": {"privacyStatus": "unlisted"}
+                }
+            ),
+            QUOTA_COST_WRITE
+        )
         return playlist["id"]
 
     def convert_subtitle_to_dict(self, subtitle):
@@ -152,71 +187,119 @@ class Client(BaseClient):
             )
         }
 
+    def execute(self, request, cost, num_retries=0):
+        """
+        Execute a Youtube API request and keep track of the number of quota
+        units it consumed. Failed requests are not counted.
+        """
+        result = request.execute(num_retries=num_retries)
+        self.quota_usage += cost
+        return result
+
+    def convert_video_to_dict(self, video):
+        created_at_datetime = parse_datetime(video['snippet']['publishedAt'])
+        created_at_timestamp = time.mktime(created_at_datetime.timetuple())
+        created_at = self.timestamp_to_str(created_at_timestamp)
+
+        upload_status = video['status']['uploadStatus']
+        status = self.STATUS_READY if upload_status == 'processed' else self.STATUS_PROCESSING
+        video_id = video['id']
+
+        encoding_progress = None
+        if status == self.STATUS_PROCESSING:
+            progress = video['processingDetails'].get('processingProgress')
+            if progress:
+                parts_processed = int(progress['partsProcessed'])
+                parts_total = int(progress['partsTotal'])
+                encoding_progress = parts_processed * 100. / parts_total
+
+        return {
+            'id': video_id,
+            'created_at': created_at,
+            'created_at_timestamp': created_at_timestamp,
+            'title':  video['snippet']['title'],
+            'thumbnail_url': "",
+            'status': status,
+            'encoding_progress': encoding_progress,
+            'embed_url': "https://www.youtube.com/embed/{}?rel=0&amp;showinfo=0".format(video_id),
+            'video_sources': [],
+            'external_link': "https://www.youtube.com/watch?v={}".format(video_id),
+        }
+
     def iter_selected_videos(self, video_ids):
         if not video_ids:
             raise ValueError("Empty video_ids")
-        # We cannot make a request with too many video IDs, otherwise the http
-        # url becomes too long, or the request is invalid. So we need to split
-        # the video_ids in smaller subarrrays.
-        index_offset = 10
-        for start_index in range(0, len(video_ids), index_offset):
-            video_ids_partial = video_ids[start_index:start_index+index_offset]
-            for video in iter_page_items(
-                    self.auth.videos().list,
+
+        # Fetch from the API the videos that are not cached
+        videos = self.video_cache.get_many(video_ids)
+        missing_video_ids = [video_id for video_id in video_ids if video_id not in videos]
+        # We cannot make a request with too many video IDs, otherwise the
+        # request is invalid. So we need to split the video_ids in smaller
+        # subarrays.
+        processed_videos = {}
+        for start_index in range(0, len(missing_video_ids), self.VIDEOS_LIST_MAX_IDS):
+            video_ids_partial = missing_video_ids[start_index:start_index+self.VIDEOS_LIST_MAX_IDS]
+            results = self.execute(
+                self.auth.videos().list(
                     part="id,snippet,status,processingDetails",
                     id=','.join(video_ids_partial)
-            ):
-                created_at_datetime = parse_datetime(video['snippet']['publishedAt'])
-                created_at_timestamp = time.mktime(created_at_datetime.timetuple())
-                created_at = self.timestamp_to_str(created_at_timestamp)
-
-                upload_status = video['status']['uploadStatus']
-                status = self.STATUS_READY if upload_status == 'processed' else self.STATUS_PROCESSING
-                video_id = video['id']
-
-                encoding_progress = None
-                if status == self.STATUS_PROCESSING:
-                    progress = video['processingDetails'].get('processingProgress')
-                    if progress:
-                        parts_processed = int(progress['partsProcessed'])
-                        parts_total = int(progress['partsTotal'])
-                        encoding_progress = parts_processed * 100. / parts_total
-
-                yield {
-                    'id': video_id,
-                    'created_at': created_at,
-                    'created_at_timestamp': created_at_timestamp,
-                    'title':  video['snippet']['title'],
-                    'thumbnail_url': "",
-                    'status': status,
-                    'encoding_progress': encoding_progress,
-                    'embed_url': "https://www.youtube.com/embed/{}?rel=0&amp;showinfo=0".format(video_id),
-                    'video_sources': [],
-                    'external_link': "https://www.youtube.com/watch?v={}".format(video_id),
-                }
+                ),
+                QUOTA_COST_LIST
+            )
+            for video in results["items"]:
+                videos[video['id']] = video
+                # Videos that are being processed are not cached, because
+                # their status is expected to change soon.
+                if video['status']['uploadStatus'] == 'processed':
+                    processed_videos[video['id']] = video
+        if processed_videos:
+            self.video_cache.set_many(processed_videos)
+
+        for video_id in video_ids:
+            if video_id in videos:
+                yield self.convert_video_to_dict(videos[video_id])
 
     ####################
     # Overridden methods
     ####################
-    def iter_videos(self):
+    def iter_videos(self, page_token=None, page_size=None):
         """Iterate on course playlist videos"""
-        playlist_items = iter_page_items(
-                self.auth.playlistItems().list,
+        # Playlists may contain videos multiple times
+        video_ids = set()
+        for video in super(Client, self).iter_videos(page_token=page_token, page_size=page_size):
+            if video['id'] not in video_ids:
+                video_ids.add(video['id'])
+                yield video
+
+    def get_videos_page(self, page_token=None, page_size=None):
+        # Playlist items cannot be listed more than 50 at a time
+        page_size = min(page_size or self.VIDEOS_PAGE_SIZE, 50)
+        results = self.execute(
+            self.auth.playlistItems().list(
                 part="id,snippet",
                 playlistId=self.playlist_id,
-                maxResults=50
+                maxResults=page_size,
+                pageToken=page_token,
+            ),
+            QUOTA_COST_LIST
         )
         video_ids = []
-        for playlist_item in playlist_items:
+        for playlist_item in results["items"]:
             resource = playlist_item['snippet']['resourceId']
             if resource['kind'] == 'youtube#video':
                 video_id = resource['videoId']
-                # Playlists may contain videos multiple times
                 if video_id not in video_ids:
                     video_ids.append(video_id)
-        if video_ids:
-            for video in self.iter_selected_videos(video_ids):
-                yield video
+        videos = list(self.iter_selected_videos(video_ids)) if video_ids else []
+        logger.info(
+            "Youtube quota usage for %s after listing videos: %d units",
+            self.course_key_string, self.quota_usage
+        )
+        return {
+            'videos': videos,
+            'count': results.get("pageInfo", {}).get("totalResults", len(results["items"])),
+            'next_page_token': results.get("nextPageToken"),
+        }
 
     def get_video(self, video_id):
         videos = self.iter_selected_videos([video_id])
@@ -227,7 +310,8 @@ class Client(BaseClient):
     def delete_video(self, video_id):
         # IMPORTANT NOTE this allows just any course staff to delete any video
         # from any course. Which is bad, obviously...
-        self.auth.videos().delete(id=video_id).execute()
+        self.execute(self.auth.videos().delete(id=video_id), QUOTA_COST_WRITE)
+        self.video_cache.delete(video_id)
 
     def update_video_title(self, video_id, title):
         if len(title) > 100:
@@ -237,7 +321,7 @@ class Client(BaseClient):
                     "Cannot set title with {count} characters"
                 ).format(count=len(title))
             )
-        self.auth.videos().update(part="snippet", body={
+        self.execute(self.auth.videos().update(part="snippet", body={
             'id':video_id,
             'snippet': {
                 'title': title,
@@ -245,7 +329,8 @@ class Client(BaseClient):
                 # https://developers.google.com/youtube/v3/docs/videos/update#request-body
                 'categoryId': self.YOUTUBE_CATEGORY_ID
             }
-        }).execute()
+        }), QUOTA_COST_WRITE)
+        self.video_cache.delete(video_id)
         return {}
 
     def create_video(self, payload, title=None):
@@ -260,24 +345,31 @@ class Client(BaseClient):
         raise NotImplementedError()
 
     def iter_subtitles(self, video_id):
-        for subtitle in self.auth.captions().list(part="id,snippet", videoId=video_id).execute()["items"]:
+        captions = self.execute(
+            self.auth.captions().list(part="id,snippet", videoId=video_id),
+            QUOTA_COST_CAPTION_LIST
+        )
+        for subtitle in captions["items"]:
             yield self.convert_subtitle_to_dict(subtitle)
 
     def delete_video_subtitle(self, video_id, subtitle_id):
-        self.auth.captions().delete(id=subtitle_id).execute()
+        self.execute(self.auth.captions().delete(id=subtitle_id), QUOTA_COST_WRITE)
 
     def upload_subtitle(self, video_id, file_object, language):
         name = self.find_next_subtitle_name(video_id, language)
-        subtitle = self.auth.captions().insert(
-            part="id,snippet", body={
-                'snippet': {
-                    'videoId': video_id,
-                    'language': language,
-                    'name': name,
-                }
-            },
-            media_body=media_body(file_object)
-        ).execute()
+        subtitle = self.execute(
+            self.auth.captions().insert(
+                part="id,snippet", body={
+                    'snippet': {
+                        'videoId': video_id,
+                        'language': language,
+                        'name': name,
+                    }
+                },
+                media_body=media_body(file_object)
+            ),
+            QUOTA_COST_CAPTION_UPLOAD
+        )
         return self.convert_subtitle_to_dict(subtitle)
 
     def find_next_subtitle_name(self, video_id, language):
@@ -289,7 +381,11 @@ class Client(BaseClient):
         # Check existing subtitles
         existing_names = []
         existing_count = 0
-        for subtitle in self.auth.captions().list(part="id,snippet", videoId=video_id).execute()["items"]:
+        captions = self.execute(
+            self.auth.captions().list(part="id,snippet", videoId=video_id),
+            QUOTA_COST_CAPTION_LIST
+        )
+        for subtitle in captions["items"]:
             if subtitle['snippet']['language'] == language:
                 existing_names.append(subtitle['snippet']['name'])
                 existing_count += 1
@@ -308,7 +404,10 @@ class Client(BaseClient):
         """
         Return the content of the subtitle file, stored on youtube.
         """
-        return self.auth.captions().download(id=subtitle_id).execute()
+        return self.execute(
+            self.auth.captions().download(id=subtitle_id),
+            QUOTA_COST_CAPTION_DOWNLOAD
+        )
 
     def get_upload_url(self, origin=None):
         # Note: because the user cannot upload directly to youtube from its
@@ -324,38 +423,73 @@ class Client(BaseClient):
             "file_parameter_name": self.FILE_PARAMETER_NAME
         }
 
-    def upload_video(self, file_object):
-        # 1) Upload video by chunks
-        chunksize = 1024*1024*5 # 5 Mb
-        video = self.auth.videos().insert(
-            part="snippet,status",
-            body={
-                "snippet": {
-                    "title": file_object.name[:100],
-                    "categoryId": self.YOUTUBE_CATEGORY_ID
+    def upload_video(self, file_object, title=None, upload=None):
+        """
+        Upload a video file by chunks and add it to the course playlist.
+
+        Args:
+            file_object (file): file-like object.
+            title (str): video title. Defaults to the file name.
+            upload (VideoUpload): if defined, the upload progress is saved
+            after every acknowledged chunk, and an interrupted upload resumes
+            from the last acknowledged chunk. The id of the uploaded video is
+            saved too, such that the video is not uploaded again if adding it
+            to the playlist fails.
+        """
+        state = upload.get() if upload is not None else None
+        video_id = state.get('video_id') if state else None
+        if video_id is None:
+            # 1) Upload video by chunks
+            request = self.auth.videos().insert(
+                part="snippet,status",
+                body={
+                    "snippet": {
+                        "title": (title or file_object.name)[:100],
+                        "categoryId": self.YOUTUBE_CATEGORY_ID
+                    },
+                    "status": {
+                        "privacyStatus": "unlisted"
+                    }
                 },
-                "status": {
-                    "privacyStatus": "unlisted"
-                }
-            },
-            media_body=media_body(file_object, chunksize=chunksize)
-        ).execute()
-
-        # 2) Add to playlist (and just pray that the request does not abort
-        # before the video is added to the playlist)
-        video_id = video["id"]
-        self.auth.playlistItems().insert(
-            part="snippet",
-            body={
-                "snippet": {
-                    "playlistId": self.playlist_id,
-                    "resourceId": {
-                        "kind": "youtube#video",
-                        "videoId": video_id,
+                media_body=media_body(file_object, chunksize=self.UPLOAD_CHUNK_SIZE)
+            )
+            if state and state.get('resumable_uri'):
+                request.resumable_uri = state['resumable_uri']
+                request.resumable_progress = state['resumable_progress']
+
+            video = None
+            while video is None:
+                status, video = request.next_chunk(num_retries=self.UPLOAD_NUM_RETRIES)
+                if status is not None and upload is not None:
+                    upload.update(
+                        progress=status.progress() * 100.,
+                        resumable_uri=request.resumable_uri,
+                        resumable_progress=request.resumable_progress,
+                    )
+            video_id = video["id"]
+            # Resumed uploads belong to the same upload session, which is
+            # counted only once it completes
+            self.quota_usage += QUOTA_COST_VIDEO_UPLOAD
+            if upload is not None:
+                upload.update(video_id=video_id)
+
+        # 2) Add to playlist
+        self.execute(
+            self.auth.playlistItems().insert(
+                part="snippet",
+                body={
+                    "snippet": {
+                        "playlistId": self.playlist_id,
+                        "resourceId": {
+                            "kind": "youtube#video",
+                            "videoId": video_id,
+                        }
                     }
                 }
-            }
-        ).execute()
+            ),
+            QUOTA_COST_WRITE,
+            num_retries=self.UPLOAD_NUM_RETRIES
+        )
 
         # This object will be passed to the create_video handler
         return {
@@ -370,17 +504,165 @@ def iter_page_items(func, *args, **kwargs):
         func: function to be called with args, kwargs as arguments. The
         pageToken argument will be added. Then the 'execute' method will be
         called on the result of each call.
+        execute (optional keyword argument): function used to execute each
+        request, called with the request and its quota cost. E.g:
+        Client.execute.
     """
+    execute = kwargs.pop("execute", lambda request, cost: request.execute())
     page_token = None
     while True:
         kwargs["pageToken"] = page_token
-        results = func(*args, **kwargs).execute()
+        results = execute(func(*args, **kwargs), QUOTA_COST_LIST)
         for item in results["items"]:
             yield item
         page_token = results.get("nextPageToken")
         if page_token is None:
             break
 
+
+class VideoCache(object):
+    """
+    Per-course store of the video metadata returned by the Youtube API. Video
+    metadata are cached for YOUTUBE_VIDEO_CACHE_TIMEOUT seconds, which saves
+    both API quota and latency when loading the video dashboard.
+    """
+
+    def __init__(self, course_key_string):
+        self.course_key_string = course_key_string
+
+    @property
+    def timeout(self):
+        return getattr(settings, "YOUTUBE_VIDEO_CACHE_TIMEOUT", 10*60)
+
+    def key(self, video_id):
+        return u"videoproviders-youtube-video-{}-{}".format(self.course_key_string, video_id)
+
+    def get_many(self, video_ids):
+        """
+        Returns:
+            videos (dict): cached videos, indexed by video id.
+        """
+        keys = dict((self.key(video_id), video_id) for video_id in video_ids)
+        return dict(
+            (keys[key], video) for key, video in cache.get_many(keys.keys()).items()
+        )
+
+    def set_many(self, videos):
+        """
+        Args:
+            videos (dict): videos indexed by video id.
+        """
+        cache.set_many(
+            dict((self.key(video_id), video) for video_id, video in videos.items()),
+            self.timeout
+        )
+
+    def delete(self, video_id):
+        cache.delete(self.key(video_id))
+
+
+class VideoUpload(object):
+    """
+    Video upload that is performed in the background by a celery worker.
+
+    Uploaded files are first spooled to YOUTUBE_UPLOAD_ROOT, which must be
+    shared between the CMS and the celery workers. The upload state is shared
+    through the cache, such that the browser can poll for the upload progress.
+    """
+
+    # Upload states are forgotten after this delay
+    TIMEOUT = 24*60*60
+
+    def __init__(self, upload_id):
+        self.upload_id = upload_id
+
+    @classmethod
+    def create(cls, course_key_string, file_object):
+        """Spool an uploaded file and create the corresponding upload state.
+
+        Args:
+            file_object (UploadedFile)
+        """
+        upload = cls(uuid.uuid4().hex)
+        upload_root = cls.upload_root()
+        if not os.path.exists(upload_root):
+            os.makedirs(upload_root)
+        # Keep the file extension, which is used to guess the video mimetype
+        path = os.path.join(upload_root, upload.upload_id + os.path.splitext(file_object.name)[1])
+        with open(path, 'wb') as f:
+            for chunk in file_object.chunks():
+                f.write(chunk)
+        cache.set(upload.key, {
+            'course_key_string': course_key_string,
+            'path': path,
+            'title': file_object.name,
+            'status': 'pending',
+            'progress': 0,
+            'video_id': None,
+            'error': None,
+            'resumable_uri': None,
+            'resumable_progress': 0,
+        }, cls.TIMEOUT)
+        return upload
+
+    @staticmethod
+    def upload_root():
+        return getattr(
+            settings, "YOUTUBE_UPLOAD_ROOT",
+            os.path.join(tempfile.gettempdir(), "youtube_uploads")
+        )
+
+    @property
+    def key(self):
+        return u"videoproviders-youtube-upload-{}".format(self.upload_id)
+
+    def get(self):
+        """
+        Returns:
+            state (dict): None if the upload does not exist.
+        """
+        return cache.get(self.key)
+
+    def update(self, **kwargs):
+        """
+        Returns:
+            state (dict): None if the upload state was forgotten, in which
+            case nothing is updated.
+        """
+        state = self.get()
+        if state is None:
+            return None
+        state.update(kwargs)
+        cache.set(self.key, state, self.TIMEOUT)
+        return state
+
+    def fail(self, error):
+        """
+        Mark the upload as failed. If the upload state was forgotten, a new
+        state is created but the course of the upload is unknown.
+        """
+        state = self.get() or {
+            'course_key_string': None,
+            'path': None,
+            'title': None,
+            'progress': 0,
+            'video_id': None,
+            'resumable_uri': None,
+            'resumable_progress': 0,
+        }
+        state.update(status='error', error=error)
+        cache.set(self.key, state, self.TIMEOUT)
+        return state
+
+    def remove_file(self):
+        """
+        Remove the spooled video file. The file path is not read from the
+        upload state, so that files are removed even after the state expired.
+        """
+        for path in glob.glob(os.path.join(self.upload_root(), self.upload_id + "*")):
+            os.remove(path)
+
+
 def media_body(file_object, chunksize=-1):
     # Guess mimetype
     mimetype, _ = mimetypes.guess_type(file_object.name)
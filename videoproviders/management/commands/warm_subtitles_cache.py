@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.models import Course
+from videoproviders.tasks import warm_course_subtitles_cache
+
+
+class Command(BaseCommand):
+    args = '<course_id_1> <course_id_2>...'
+    help = """Queue the conversion of the subtitles of the given courses to
+WebVTT, such that learners never have to wait for the conversion.
+"""
+    option_list = BaseCommand.option_list + (
+        make_option('--all',
+            action='store_true',
+            dest='all',
+            default=False,
+            help='Warm the subtitles of all active courses.'),
+    )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            course_key_strings = Course.objects.filter(is_active=True).values_list('key', flat=True)
+        elif args:
+            course_key_strings = args
+        else:
+            raise CommandError("Define at least one course_id argument, or use --all")
+
+        for course_key_string in course_key_strings:
+            warm_course_subtitles_cache.delay(course_key_string)
+            self.stdout.write("Queued subtitles warming for course {}\n".format(course_key_string))
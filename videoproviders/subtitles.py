@@ -1,4 +1,10 @@
+import gzip
+import hashlib
 import logging
+import os
+import tempfile
+from time import time
+
 import pycaption
 import requests
 
@@ -6,43 +12,300 @@ from django.conf import settings
 from django.core.cache import caches
 
 
+# Subtitle url metadata: hash of the source file and HTTP validators
 SUBTITLE_CACHE = caches["video_subtitles"]
+# Period after which the source subtitle files are revalidated, in seconds
+SUBTITLE_CACHE_TIMEOUT = 24*60*60
+
+# Subtitle files are downloaded by chunks of this size, in bytes
+SUBTITLE_CHUNK_SIZE = 64*1024
+
+# HTTP session shared by all subtitle downloads, such that connections to the
+# subtitle storage servers are pooled
+SESSION = requests.Session()
 
 logger = logging.getLogger(__name__)
 
 
+class SubtitleStore(object):
+    """Content-addressed store of WebVTT subtitles.
+
+    Converted subtitles are stored gzip-compressed in SUBTITLES_STORE_ROOT,
+    under the sha1 hash of the source subtitle file. The total size of the
+    store is kept below SUBTITLES_STORE_MAX_BYTES by evicting the least
+    recently used entries.
+
+    Listing the store is costly, so eviction runs only when a running
+    estimate of the store size exceeds the budget. Because other processes
+    write to the same store, eviction also runs every EVICTION_INTERVAL writes.
+    """
+
+    # Maximum number of writes between two evictions
+    EVICTION_INTERVAL = 100
+    # Entries are marked as recently used at most once per interval, in
+    # seconds, such that most reads do not write to the filesystem
+    TOUCH_INTERVAL = 60*60
+
+    def __init__(self):
+        # Estimated total size of the store, unknown until the first eviction
+        self.size = None
+        self.writes_since_eviction = 0
+
+    @property
+    def root(self):
+        return getattr(
+            settings, "SUBTITLES_STORE_ROOT",
+            os.path.join(tempfile.gettempdir(), "video_subtitles_store")
+        )
+
+    @property
+    def max_bytes(self):
+        return getattr(settings, "SUBTITLES_STORE_MAX_BYTES", 500*1024*1024)
+
+    def path(self, digest):
+        return os.path.join(self.root, digest + ".vtt.gz")
+
+    def get(self, digest):
+        """
+        Returns:
+            caps (unicode): None if the entry does not exist.
+        """
+        path = self.path(digest)
+        try:
+            with gzip.open(path, 'rb') as f:
+                caps = f.read().decode('utf-8')
+            # Mark entry as recently used
+            if time() - os.path.getmtime(path) > self.TOUCH_INTERVAL:
+                os.utime(path, None)
+        except (IOError, OSError):
+            return None
+        return caps
+
+    def set(self, digest, caps):
+        if not os.path.exists(self.root):
+            os.makedirs(self.root)
+        # Write to a temporary file first, so that concurrent readers never
+        # read partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            with gzip.GzipFile(fileobj=f, mode='wb') as gzip_file:
+                gzip_file.write(caps.encode('utf-8'))
+        path = self.path(digest)
+        os.rename(tmp_path, path)
+
+        self.writes_since_eviction += 1
+        if self.size is not None:
+            self.size += os.path.getsize(path)
+        if (self.size is None or self.size > self.max_bytes
+                or self.writes_since_eviction >= self.EVICTION_INTERVAL):
+            self.evict()
+
+    def clear(self):
+        for path, _size, _mtime in self.iter_entries():
+            remove_file(path)
+        self.size = 0
+        self.writes_since_eviction = 0
+
+    def evict(self):
+        """Remove least recently used entries until the total store size fits
+        within the budget."""
+        entries = sorted(self.iter_entries(), key=lambda entry: entry[2])
+        total_size = sum(size for _path, size, _mtime in entries)
+        for path, size, _mtime in entries:
+            if total_size <= self.max_bytes:
+                break
+            remove_file(path)
+            total_size -= size
+        self.size = total_size
+        self.writes_since_eviction = 0
+
+    def iter_entries(self):
+        """Iterate on (path, size, last usage time) store entries."""
+        if not os.path.exists(self.root):
+            return
+        for name in os.listdir(self.root):
+            if not name.endswith(".vtt.gz"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # File was concurrently removed
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+
+SUBTITLE_STORE = SubtitleStore()
+
+
 def get_vtt_content(url):
     """Get the content of a subtitle file converted to WebVTT format.
 
-    A caching strategy based on the url of the subtitle file is setup so that
-    we don't have to redownload the files every time.
+    Converted subtitles are stored in SUBTITLE_STORE, indexed by the hash of
+    the source file. The source file is revalidated with a conditional GET
+    every SUBTITLE_CACHE_TIMEOUT seconds: unchanged files are neither
+    redownloaded nor reconverted.
+
+    Relative urls, which are used by some providers such as Youtube, cannot
+    be fetched from here: their subtitles are only available once they were
+    stored by warm_subtitles_cache.
 
     Args:
         url (str): may point to e.g. an srt file.
 
     Returns:
         caps (unicode): vtt-formatted subtitles content. Returns None if
-            subtitles could not be converted to VTT or if the original subtitle
-            file exceeds SUBTITLE_MAX_BYTES.
+            subtitles could not be converted to VTT. Returns an empty string if
+            the original subtitle file exceeds SUBTITLE_MAX_BYTES.
     """
-    caps = SUBTITLE_CACHE.get(url)
-    if caps is None:
-        response = requests.get(url, stream=True)
-        if response.status_code < 400:
-            # Maximum subtitle file size, in bytes
-            subtitle_max_bytes = getattr(settings, "SUBTITLES_MAX_BYTES", 5*1024*1024)
-            content = ""
-            for chunk in response.iter_content(chunk_size=1024):
-                content += chunk
-                if len(content) > subtitle_max_bytes:
-                    logger.error("Trying to load large subtitle file from %s", url)
-                    content = ""
-                    break
-            caps = convert_to_vtt(content) if content else ""
-            if caps is not None:
-                SUBTITLE_CACHE.set(url, caps, 24*60*60)
+    metadata = SUBTITLE_CACHE.get(url)
+    caps = get_stored_caps(metadata) if metadata is not None else None
+    if not url.startswith('http'):
+        return caps
+    headers = {}
+    if caps is not None:
+        if time() - metadata['checked_at'] < SUBTITLE_CACHE_TIMEOUT:
+            return caps
+        # Revalidate source file
+        headers = conditional_headers(metadata)
+
+    response = SESSION.get(url, stream=True, headers=headers)
+    if response.status_code == 304 and caps is not None:
+        # Source file was not modified
+        response.close()
+        metadata['checked_at'] = time()
+        SUBTITLE_CACHE.set(url, metadata, None)
+        return caps
+    if response.status_code >= 400:
+        return None
+    return store_subtitle(
+        url, read_subtitle(url, response),
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+    )
+
+def get_client_vtt_content(api_client, subtitle):
+    """Same as get_vtt_content, but the subtitle file is downloaded through
+    the video provider client. This is required for subtitles that are served
+    through relative urls.
+
+    Args:
+        subtitle (dict): as returned by api_client.iter_subtitles.
+    """
+    url = subtitle['url']
+    metadata = SUBTITLE_CACHE.get(url)
+    caps = get_stored_caps(metadata) if metadata is not None else None
+    if caps is not None and time() - metadata['checked_at'] < SUBTITLE_CACHE_TIMEOUT:
+        return caps
+    content = api_client.download_subtitle(subtitle['id'])
+    if len(content) > get_subtitle_max_bytes():
+        logger.error("Trying to load large subtitle file from %s", url)
+        content = ""
+    return store_subtitle(url, content)
+
+def store_subtitle(url, content, etag=None, last_modified=None):
+    """Convert the content of a subtitle file, store it in SUBTITLE_STORE
+    and associate it to the subtitle url.
+
+    Returns:
+        caps (unicode): None if subtitles could not be converted to VTT.
+    """
+    metadata = {
+        'digest': None,
+        'etag': etag,
+        'last_modified': last_modified,
+        'checked_at': time(),
+    }
+    caps = ""
+    if content:
+        metadata['digest'] = subtitle_digest(content)
+        caps = SUBTITLE_STORE.get(metadata['digest'])
+        if caps is None:
+            caps = convert_to_vtt(content)
+            if caps is None:
+                return None
+            SUBTITLE_STORE.set(metadata['digest'], caps)
+    SUBTITLE_CACHE.set(url, metadata, None)
     return caps
 
+def get_stored_caps(metadata):
+    """Return the converted subtitles associated to url metadata, or None if
+    they were evicted from the store."""
+    if metadata['digest'] is None:
+        # Source file was too large
+        return ""
+    return SUBTITLE_STORE.get(metadata['digest'])
+
+def conditional_headers(metadata):
+    headers = {}
+    if metadata.get('etag'):
+        headers['If-None-Match'] = metadata['etag']
+    if metadata.get('last_modified'):
+        headers['If-Modified-Since'] = metadata['last_modified']
+    return headers
+
+def subtitle_digest(content):
+    if isinstance(content, unicode):
+        content = content.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+def read_subtitle(url, response):
+    """Read the raw content of a subtitle file from a streamed response.
+
+    Chunks are accumulated in a list and joined only once, so that large files
+    are not copied over and over.
+
+    Returns:
+        content (str): empty if the file exceeds SUBTITLES_MAX_BYTES.
+    """
+    subtitle_max_bytes = get_subtitle_max_bytes()
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=SUBTITLE_CHUNK_SIZE):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > subtitle_max_bytes:
+            logger.error("Trying to load large subtitle file from %s", url)
+            response.close()
+            return ""
+    return "".join(chunks)
+
+def get_subtitle_max_bytes():
+    """Maximum subtitle file size, in bytes"""
+    return getattr(settings, "SUBTITLES_MAX_BYTES", 5*1024*1024)
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        # File was concurrently removed
+        pass
+
+def warm_subtitles_cache(api_client, video_ids=None):
+    """Convert subtitles to WebVTT and store them in the subtitle cache ahead of
+    time, so that learners do not have to wait for the conversion.
+
+    Args:
+        api_client: video provider client of the course.
+        video_ids (list): restrict to the subtitles of these videos. By
+            default, the subtitles of all course videos are converted.
+
+    Returns:
+        count (int): number of subtitle files available in the cache.
+    """
+    if video_ids is None:
+        video_ids = [video['id'] for video in api_client.iter_videos()]
+    count = 0
+    for video_id in video_ids:
+        for subtitle in api_client.iter_subtitles(video_id):
+            if subtitle['url'].startswith('http'):
+                caps = get_vtt_content(subtitle['url'])
+            else:
+                caps = get_client_vtt_content(api_client, subtitle)
+            if caps is not None:
+                count += 1
+    return count
+
 def convert_to_vtt(caps):
     """Convert subtitles to WebVTT format
 
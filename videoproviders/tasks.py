@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from celery import shared_task
+
+from .api import get_client, MissingCredentials
+from .api.youtube import Client as YoutubeClient, VideoUpload
+from .subtitles import warm_subtitles_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def warm_course_subtitles_cache(course_key_string, video_ids=None):
+    '''
+    Convert the subtitles of a course to WebVTT in the background, such that
+    learners never have to wait for the conversion.
+    Can be used for instance after a subtitle upload, or for all courses with
+    the warm_subtitles_cache management command.
+    '''
+    try:
+        return warm_subtitles_cache(get_client(course_key_string), video_ids=video_ids)
+    except MissingCredentials:
+        logger.info("No video provider credentials for course %s, subtitles are not warmed", course_key_string)
+        return 0
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60)
+def upload_youtube_video(self, upload_id):
+    '''
+    Upload a spooled video file to Youtube. In case of failure, the task is
+    retried and the upload resumes from the last acknowledged chunk.
+    '''
+    upload = VideoUpload(upload_id)
+    state = upload.update(status='uploading')
+    if state is None:
+        # The upload state expired before a worker could pick up the task
+        logger.error("Upload state of video %s was not found, upload is aborted", upload_id)
+        upload.fail("Upload state expired")
+        upload.remove_file()
+        return
+
+    retry = False
+    try:
+        with open(state['path'], 'rb') as video_file:
+            video = YoutubeClient(state['course_key_string']).upload_video(
+                video_file, title=state['title'], upload=upload
+            )
+    except Exception as e: # pylint: disable=broad-except
+        if self.request.retries < self.max_retries:
+            retry = True
+            raise self.retry(exc=e)
+        logger.exception("Could not upload video %s to Youtube", upload_id)
+        upload.fail(unicode(e))
+    else:
+        if upload.update(status='uploaded', progress=100, video_id=video['id']) is None:
+            logger.error(
+                "Upload state of video %s expired during upload to Youtube (video id: %s)",
+                upload_id, video['id']
+            )
+    finally:
+        # Keep the spooled file for the next attempt
+        if not retry:
+            upload.remove_file()
@@ -1,5 +1,6 @@
 import logging
 import os.path
+import time
 
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -14,43 +15,148 @@ class SubtitlesTests(TestCase):
 
     def setUp(self):
         subtitles.SUBTITLE_CACHE.clear()
+        subtitles.SUBTITLE_STORE.clear()
         self.url = 'http://sub.com/sub.fr.srt'
 
     def get_fixture_content(self, file_name):
         with open(os.path.join(os.path.dirname(__file__), 'fixtures', file_name)) as f:
             return f.read()
 
-    @patch('requests.get')
+    @patch('videoproviders.subtitles.SESSION.get')
     def test_get_vtt_content_from_srt_file(self, mock_get):
         mock_get.return_value = Mock(
             status_code=200,
+            headers={},
             iter_content=Mock(return_value=fixtures.get_content('sub.fr.srt'))
         )
         vtt_content = subtitles.get_vtt_content(self.url)
 
-        mock_get.assert_called_once_with(self.url, stream=True)
+        mock_get.assert_called_once_with(self.url, stream=True, headers={})
         self.assertEqual(self.get_fixture_content('sub.fr.vtt').decode("utf-8"), vtt_content)
 
-    @patch('requests.get')
+    @patch('videoproviders.subtitles.SESSION.get')
     def test_vtt_content_is_cached(self, mock_get):
         mock_get.return_value = Mock(
             status_code=200,
+            headers={},
             iter_content=Mock(return_value=self.get_fixture_content('sub.fr.srt'))
         )
         subtitles.get_vtt_content(self.url)
         subtitles.get_vtt_content(self.url)
 
-        mock_get.assert_called_once_with(self.url, stream=True)
+        mock_get.assert_called_once_with(self.url, stream=True, headers={})
+
+    @patch('videoproviders.subtitles.SESSION.get')
+    def test_identical_subtitles_are_stored_once(self, mock_get):
+        mock_get.return_value = Mock(
+            status_code=200,
+            headers={},
+            iter_content=Mock(return_value=self.get_fixture_content('sub.fr.srt'))
+        )
+        vtt_content1 = subtitles.get_vtt_content(self.url)
+        vtt_content2 = subtitles.get_vtt_content('http://sub.com/copy.fr.srt')
+
+        self.assertEqual(vtt_content1, vtt_content2)
+        self.assertEqual(1, len(list(subtitles.SUBTITLE_STORE.iter_entries())))
+
+    @patch('videoproviders.subtitles.SESSION.get')
+    def test_unmodified_subtitles_are_revalidated(self, mock_get):
+        mock_get.return_value = Mock(
+            status_code=200,
+            headers={'ETag': '"etag"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+            iter_content=Mock(return_value=self.get_fixture_content('sub.fr.srt'))
+        )
+        vtt_content = subtitles.get_vtt_content(self.url)
+
+        # Expire url metadata
+        metadata = subtitles.SUBTITLE_CACHE.get(self.url)
+        metadata['checked_at'] -= subtitles.SUBTITLE_CACHE_TIMEOUT
+        subtitles.SUBTITLE_CACHE.set(self.url, metadata)
+        mock_get.return_value = Mock(status_code=304)
+        with patch('videoproviders.subtitles.convert_to_vtt') as mock_convert_to_vtt:
+            self.assertEqual(vtt_content, subtitles.get_vtt_content(self.url))
+        mock_convert_to_vtt.assert_not_called()
+        mock_get.assert_called_with(self.url, stream=True, headers={
+            'If-None-Match': '"etag"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        })
+
+    def test_least_recently_used_subtitles_are_evicted(self):
+        store = subtitles.SUBTITLE_STORE
+        store.set('digest1', u"WEBVTT1")
+        store.set('digest2', u"WEBVTT2")
+        os.utime(store.path('digest1'), (1000, 1000))
+        os.utime(store.path('digest2'), (2000, 2000))
+        # digest1 becomes the most recently used entry
+        self.assertEqual(u"WEBVTT1", store.get('digest1'))
+
+        # The store can only hold two entries
+        entry_size = os.path.getsize(store.path('digest1'))
+        with override_settings(SUBTITLES_STORE_MAX_BYTES=2*entry_size):
+            store.set('digest3', u"WEBVTT3")
+
+        self.assertIsNone(store.get('digest2'))
+        self.assertEqual(u"WEBVTT1", store.get('digest1'))
+        self.assertEqual(u"WEBVTT3", store.get('digest3'))
+
+    def test_recently_used_subtitles_are_not_touched_on_read(self):
+        store = subtitles.SUBTITLE_STORE
+        store.set('digest1', u"WEBVTT")
+        recently = int(time.time()) - 10
+        os.utime(store.path('digest1'), (recently, recently))
+
+        self.assertEqual(u"WEBVTT", store.get('digest1'))
+        self.assertEqual(recently, os.path.getmtime(store.path('digest1')))
+
+    def test_store_is_not_listed_on_every_write(self):
+        with patch.object(subtitles.SubtitleStore, 'iter_entries', return_value=[]) as mock_iter_entries:
+            subtitles.SUBTITLE_STORE.set('digest1', u"WEBVTT")
+            subtitles.SUBTITLE_STORE.set('digest2', u"WEBVTT")
+            self.assertEqual(0, mock_iter_entries.call_count)
+
+            with override_settings(SUBTITLES_STORE_MAX_BYTES=1):
+                subtitles.SUBTITLE_STORE.set('digest3', u"WEBVTT")
+            self.assertEqual(1, mock_iter_entries.call_count)
 
     @override_settings(SUBTITLES_MAX_BYTES=10)
-    @patch('requests.get')
+    @patch('videoproviders.subtitles.SESSION.get')
     def test_large_vtt_content_is_not_loaded(self, mock_get):
         mock_get.return_value = Mock(
             status_code=200,
+            headers={},
             iter_content=Mock(return_value=self.get_fixture_content('sub.fr.srt'))
         )
         subtitles.logger.setLevel(logging.FATAL)
 
         self.assertEqual(0, len(subtitles.get_vtt_content(self.url)))
-        mock_get.assert_called_once_with(self.url, stream=True)
-        self.assertEqual("", subtitles.SUBTITLE_CACHE.get(self.url))
+        self.assertEqual(0, len(subtitles.get_vtt_content(self.url)))
+        mock_get.assert_called_once_with(self.url, stream=True, headers={})
+        self.assertEqual([], list(subtitles.SUBTITLE_STORE.iter_entries()))
+
+    @patch('videoproviders.subtitles.SESSION.get')
+    def test_warm_subtitles_cache(self, mock_get):
+        mock_get.return_value = Mock(
+            status_code=200,
+            headers={},
+            iter_content=Mock(return_value=self.get_fixture_content('sub.fr.srt'))
+        )
+        api_client = Mock(
+            iter_videos=Mock(return_value=[{'id': 'videoid'}]),
+            iter_subtitles=Mock(return_value=[
+                {'id': 'subid1', 'language': 'fr', 'url': self.url},
+                {'id': 'subid2', 'language': 'en', 'url': '//cms/relative/url'},
+            ]),
+            download_subtitle=Mock(return_value=self.get_fixture_content('sub.fr.srt'))
+        )
+
+        self.assertEqual(2, subtitles.warm_subtitles_cache(api_client))
+        self.assertEqual(2, subtitles.warm_subtitles_cache(api_client))
+        mock_get.assert_called_once_with(self.url, stream=True, headers={})
+        api_client.download_subtitle.assert_called_once_with('subid2')
+        api_client.iter_subtitles.assert_called_with('videoid')
+        # Identical subtitles are stored once
+        self.assertEqual(1, len(list(subtitles.SUBTITLE_STORE.iter_entries())))
+        # Subtitles served through relative urls are available once warmed
+        self.assertEqual(
+            subtitles.get_vtt_content(self.url), subtitles.get_vtt_content('//cms/relative/url')
+        )
@@ -122,3 +122,28 @@ class VideofrontTests(TestCase):
         client.post.assert_called_once()
         self.assertEqual(1, models.VideofrontCourseSettings.objects.count())
         self.assertEqual('playlistid', models.VideofrontCourseSettings.objects.get().playlist_id)
+
+    def test_get_videos_page(self):
+        models.VideofrontCourseSettings.objects.create(course_id=self.course_id, playlist_id='playlistid')
+        client = videofront.Client(self.course_key_string)
+        video = get_json_content('videofront/video_success.json')
+        client.get = Mock(return_value=Mock(
+            json=Mock(return_value=[video, video, video])
+        ))
+
+        page1 = client.get_videos_page(page_size=2)
+        page2 = client.get_videos_page(page_token=page1['next_page_token'], page_size=2)
+
+        self.assertEqual(2, len(page1['videos']))
+        self.assertEqual(3, page1['count'])
+        self.assertEqual('2', page1['next_page_token'])
+        self.assertEqual(1, len(page2['videos']))
+        self.assertIsNone(page2['next_page_token'])
+        self.assertEqual(3, len(client.get_videos()))
+
+    def test_get_videos_page_with_invalid_token(self):
+        models.VideofrontCourseSettings.objects.create(course_id=self.course_id, playlist_id='playlistid')
+        client = videofront.Client(self.course_key_string)
+        client.get = Mock(return_value=Mock(json=Mock(return_value=[])))
+
+        self.assertRaises(videofront.ClientError, client.get_videos_page, page_token='notanoffset')
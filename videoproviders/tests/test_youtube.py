@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 import json
 import mock
+import os
 import tempfile
 
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -12,8 +15,9 @@ from opaque_keys.edx.keys import CourseKey
 
 from fun.tests.utils import skipUnlessCms
 from universities.tests.factories import UniversityFactory
-from videoproviders.api.youtube import MissingCredentials, Client
+from videoproviders.api.youtube import MissingCredentials, Client, VideoUpload
 from videoproviders.models import YoutubeAuth, YoutubeCourseSettings
+from videoproviders.tasks import upload_youtube_video
 
 from . import fixtures
 
@@ -24,6 +28,12 @@ def mock_download_service(execute_return_value):
     return mock.Mock(return_value=MockResource('download', execute_return_value))
 def mock_insert_service(execute_return_value):
     return mock.Mock(return_value=MockResource('insert', execute_return_value))
+def mock_upload_service(upload_return_value):
+    return mock.Mock(return_value=mock.Mock(**{
+        'insert.return_value': mock.Mock(**{
+            'next_chunk.return_value': (None, upload_return_value)
+        })
+    }))
 
 class MockResource(object):
     """
@@ -46,6 +56,7 @@ class BaseYoutubeTestCase(TestCase):
     """
 
     def setUp(self):
+        cache.clear()
         self.course_key_string = "org/coursename/run"
         self.youtube_client = Client(self.course_key_string)
 
@@ -131,6 +142,66 @@ class YoutubeTests(BaseYoutubeTestCase):
         self.assertEqual("Video title 1", videos[0]["title"])
         self.assertEqual("4 juillet 2016 13:12", videos[0]["created_at"])
 
+    def test_get_videos_page(self):
+        self.create_course_settings()
+        playlist_items = fixtures.get_json_content("youtube/playlist_items1.json")
+        playlist_items["nextPageToken"] = "nextpagetoken"
+        playlist_items["pageInfo"]["totalResults"] = 12
+        self.youtube_client.auth.playlistItems = mock_list_service(playlist_items)
+        self.youtube_client.auth.videos = mock_list_service(fixtures.get_json_content(
+            "youtube/video1.json"
+        ))
+
+        page = self.youtube_client.get_videos_page(page_token="pagetoken", page_size=1)
+
+        self.youtube_client.auth.playlistItems.return_value.list.assert_called_once_with(
+            playlistId="playlistid1",
+            part="id,snippet",
+            pageToken="pagetoken",
+            maxResults=1
+        )
+        self.assertEqual(1, len(page["videos"]))
+        self.assertEqual("videoid1", page["videos"][0]["id"])
+        self.assertEqual(12, page["count"])
+        self.assertEqual("nextpagetoken", page["next_page_token"])
+
+    def test_iter_selected_videos_batches_ids(self):
+        video_ids = ["videoid{}".format(i) for i in range(120)]
+        self.youtube_client.auth.videos = mock_list_service({"items": []})
+
+        list(self.youtube_client.iter_selected_videos(video_ids))
+
+        list_calls = self.youtube_client.auth.videos.return_value.list.call_args_list
+        self.assertEqual(3, len(list_calls))
+        self.assertEqual(50, len(list_calls[0][1]["id"].split(",")))
+        self.assertEqual(20, len(list_calls[2][1]["id"].split(",")))
+        self.assertEqual(3, self.youtube_client.quota_usage)
+
+    def test_failed_requests_are_not_counted_in_quota_usage(self):
+        request = mock.Mock(**{'execute.side_effect': ValueError})
+        self.assertRaises(ValueError, self.youtube_client.execute, request, 50)
+        self.assertEqual(0, self.youtube_client.quota_usage)
+
+    def test_iter_selected_videos_are_cached(self):
+        self.youtube_client.auth.videos = mock_list_service(fixtures.get_json_content(
+            "youtube/video1.json"
+        ))
+
+        videos1 = list(self.youtube_client.iter_selected_videos(["videoid1"]))
+        videos2 = list(Client(self.course_key_string).iter_selected_videos(["videoid1"]))
+
+        self.youtube_client.auth.videos.return_value.list.assert_called_once()
+        self.assertEqual(videos1, videos2)
+
+    def test_videos_in_progress_are_not_cached(self):
+        self.youtube_client.auth.videos = mock_list_service(fixtures.get_json_content(
+            "youtube/video1_in_progress.json"
+        ))
+
+        list(self.youtube_client.iter_selected_videos(["videoid1"]))
+
+        self.assertEqual({}, self.youtube_client.video_cache.get_many(["videoid1"]))
+
     def test_iter_video_encoding_in_progress(self):
         self.create_course_settings()
         self.youtube_client.auth.playlistItems = mock_list_service(fixtures.get_json_content(
@@ -248,7 +319,7 @@ class YoutubeCmsTests(BaseYoutubeTestCase):
         video_file = tempfile.NamedTemporaryFile(prefix="test_youtube_video", suffix=".mp4")
 
         # Upload video
-        self.youtube_client.auth.videos = mock_insert_service({
+        self.youtube_client.auth.videos = mock_upload_service({
             "id": "videoid1"
         })
         self.youtube_client.auth.playlistItems = mock_insert_service({})
@@ -263,6 +334,39 @@ class YoutubeCmsTests(BaseYoutubeTestCase):
         self.assertEqual({"id": "videoid1"}, video)
         self.assertEqual("videoid1", created_video["id"])
 
+    def test_resume_upload_video(self):
+        self.create_course_settings()
+        video_file = tempfile.NamedTemporaryFile(prefix="test_youtube_video", suffix=".mp4")
+        upload = mock.Mock(**{'get.return_value': {
+            'resumable_uri': 'http://resumable',
+            'resumable_progress': 1024,
+        }})
+        self.youtube_client.auth.videos = mock_upload_service({"id": "videoid1"})
+        self.youtube_client.auth.playlistItems = mock_insert_service({})
+
+        self.youtube_client.upload_video(video_file, upload=upload)
+
+        request = self.youtube_client.auth.videos.return_value.insert.return_value
+        self.assertEqual('http://resumable', request.resumable_uri)
+        self.assertEqual(1024, request.resumable_progress)
+
+    def test_uploaded_video_is_not_uploaded_again(self):
+        self.create_course_settings()
+        video_file = tempfile.NamedTemporaryFile(prefix="test_youtube_video", suffix=".mp4")
+        upload = mock.Mock(**{'get.return_value': {
+            'resumable_uri': 'http://resumable',
+            'resumable_progress': 1024,
+            'video_id': 'videoid1',
+        }})
+        self.youtube_client.auth.videos = mock_upload_service({"id": "videoid2"})
+        self.youtube_client.auth.playlistItems = mock_insert_service({})
+
+        video = self.youtube_client.upload_video(video_file, upload=upload)
+
+        self.assertEqual({"id": "videoid1"}, video)
+        self.assertFalse(self.youtube_client.auth.videos.called)
+        self.assertEqual(50, self.youtube_client.quota_usage)
+
     @mock.patch('videoproviders.api.youtube.Client.upload_video')
     def test_upload_video_view(self, mock_upload_video):
         mock_upload_video.return_value = {"id": "videoid1"}
@@ -274,6 +378,30 @@ class YoutubeCmsTests(BaseYoutubeTestCase):
             "name": video_file.name,
             Client.FILE_PARAMETER_NAME: video_file
         })
-
         self.assertEqual(200, upload_response.status_code)
-        self.assertEqual({"id": "videoid1"}, json.loads(upload_response.content))
+
+        # Upload is performed by an (eager) celery task
+        progress_response = self.client.get(json.loads(upload_response.content)["progress_url"])
+        self.assertEqual(200, progress_response.status_code)
+        self.assertEqual(
+            {"id": "videoid1", "status": "uploaded", "progress": 100},
+            json.loads(progress_response.content)
+        )
+        self.assertEqual(1, mock_upload_video.call_count)
+
+    @mock.patch('videoproviders.api.youtube.Client.upload_video')
+    def test_upload_video_with_expired_state(self, mock_upload_video):
+        upload_root = tempfile.mkdtemp()
+        with override_settings(YOUTUBE_UPLOAD_ROOT=upload_root):
+            upload = VideoUpload.create(
+                self.course_key_string,
+                SimpleUploadedFile("video.mp4", "video content")
+            )
+            cache.delete(upload.key)
+
+            upload_youtube_video(upload.upload_id)
+
+        self.assertFalse(mock_upload_video.called)
+        self.assertEqual([], os.listdir(upload_root))
+        self.assertEqual('error', upload.get()['status'])
+        os.rmdir(upload_root)